@@ -4,10 +4,15 @@ Separates Flask app from bot logic for Gunicorn deployment
 """
 
 import os
+import gc
+import hmac
+import itertools
 import logging
+import threading
 import time
-from flask import Flask, request, jsonify
-from telegram import Update
+from concurrent.futures import ThreadPoolExecutor
+from flask import Flask, Response, request
+from json_helper import json_loads, json_dumps, json_response
 
 # Configure logging
 logging.basicConfig(
@@ -16,121 +21,333 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Memory monitoring (optional)
+try:
+    import psutil
+except ImportError:
+    psutil = None
+    logger.warning("psutil not available, memory monitoring disabled")
+
+_process = None
+
+def _get_process():
+    """Return a psutil handle for this process, reused across requests (None without psutil)"""
+    global _process
+    if psutil is None:
+        return None
+    # Re-create after a fork, gunicorn preloads the app in the master process
+    if _process is None or _process.pid != os.getpid():
+        _process = psutil.Process()
+    return _process
+
+# Memory readings are reused for a short interval so frequent polling doesn't hit /proc every time
+MEMORY_SAMPLE_INTERVAL = 2.0  # seconds
+_memory_sample = {'taken': 0.0, 'rss_mb': None}
+
+def _sample_rss_mb() -> float:
+    """Return the resident memory of this process in MB, sampled at most every MEMORY_SAMPLE_INTERVAL"""
+    now = time.monotonic()
+    if _memory_sample['rss_mb'] is None or now - _memory_sample['taken'] >= MEMORY_SAMPLE_INTERVAL:
+        process = _get_process()
+        if process is None:
+            raise RuntimeError("psutil not available")
+        _memory_sample['rss_mb'] = round(process.memory_info().rss / 1024 / 1024, 2)
+        _memory_sample['taken'] = now
+    return _memory_sample['rss_mb']
+
+# Prepared responses for the static endpoints hit by uptime monitors
+_INDEX_RESPONSE = (
+    json_dumps({"status": "OK", "message": "Pryme Claim Bot is running"}),
+    200,
+    {'Content-Type': 'application/json'}
+)
+_HEALTH_OK = (b"OK", 200, {'Content-Type': 'text/plain'})
+
 # Global variables for bot instance and app state
 bot_instance = None
+telegram_bot = None  # bot_instance.updater.bot, bound once for the webhook hot path
+dispatcher = None  # bot_instance.dispatcher, bound once for the webhook hot path
 start_time = time.time()
-health_check_count = 0
+health_check_counter = itertools.count(1)  # next() is atomic under the GIL, no global rebinding needed
+webhook_set = False
+
+# Backoff between failed set_webhook attempts, doubling from the initial delay up to the cap
+WEBHOOK_RETRY_INITIAL_DELAY = 5  # seconds
+WEBHOOK_RETRY_MAX_DELAY = 300  # seconds
+
+webhook_secret_token = None  # bytes, when set webhook POSTs without the matching header are rejected before parsing
+
+# Updates are handled off the request thread so slow Google API calls don't hold up the webhook response
+# Handlers mostly wait on Telegram and Google APIs, so this can be raised well past the CPU count,
+# keep TELEGRAM_CON_POOL_SIZE at least as large so workers don't queue for a connection
+UPDATE_WORKERS = int(os.environ.get('UPDATE_WORKERS', 8))
+# One single-threaded worker per slot, each chat always maps to the same slot so its updates run in
+# arrival order. ConversationHandler reads a chat's state before the callback and stores it after,
+# two updates from one chat handled concurrently would both act on the same state.
+update_executors = [
+    ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"UpdateWorker{i}")
+    for i in range(UPDATE_WORKERS)
+]
+
+# Bound on updates accepted but not yet processed, beyond this Telegram is asked to retry later
+MAX_PENDING_UPDATES = 1024
+pending_updates = threading.BoundedSemaphore(MAX_PENDING_UPDATES)
+
+# Constant fields of the /health/detailed response
+_HEALTH_STATIC = {
+    'status': 'healthy',
+    'service': 'telegram-claim-bot',
+    'monitoring_interval': '10_minutes',
+    'version': '1.0.0',
+    'deployment': 'render_production_gunicorn',
+    'telegram_bot_version': '13.15',
+    'wsgi_server': 'gunicorn'
+}
+# The same fields pre-encoded as the closing part of a JSON object: ,"status":...}
+_HEALTH_STATIC_JSON_TAIL = b',' + json_dumps(_HEALTH_STATIC)[1:]
+
+# Constant fields of the /status response
+_STATUS_STATIC = {
+    'status': 'running',
+    'server': 'gunicorn'
+}
+
+# Serialized /health/detailed body, reused for a few seconds across rapid polls
+HEALTH_DETAILED_TTL = 5  # seconds
+_health_detailed_cache = {'expires': 0.0, 'body': None}
+
+def _executor_for(update):
+    """Pick the update worker for the chat (or, for chat-less updates, the user) an update belongs to"""
+    chat = update.effective_chat
+    if chat is not None:
+        key = chat.id
+    else:
+        user = update.effective_user
+        key = user.id if user is not None else 0
+    return update_executors[hash(key) % UPDATE_WORKERS]
+
+def _process_update(update):
+    """Process a Telegram update in the background, logging any failure"""
+    try:
+        dispatcher.process_update(update)
+    except Exception as e:
+        logger.error("Update processing error: %s", e)
+    finally:
+        pending_updates.release()
+
+_HEALTH_OK_HEADERS = [('Content-Type', 'text/plain'), ('Content-Length', '2')]
+
+def _health_short_circuit(wsgi_app):
+    """
+    WSGI middleware answering liveness probes on /health before Flask routing runs.
+    
+    Only the healthy case is handled here; until the bot is initialized requests fall
+    through to the Flask route, which returns 503.
+    """
+    def middleware(environ, start_response):
+        method = environ.get('REQUEST_METHOD')
+        if environ.get('PATH_INFO') == '/health' and method in ('GET', 'HEAD') and bot_instance is not None:
+            start_response('200 OK', _HEALTH_OK_HEADERS)
+            return [b'OK' if method == 'GET' else b'']
+        return wsgi_app(environ, start_response)
+    
+    return middleware
 
 def create_app():
     """Create and configure Flask application"""
     app = Flask(__name__)
     
+    @app.before_request
+    def ensure_bot_initialization():
+        """Kick off bot initialization if no worker hook has started it yet"""
+        if bot_instance is None:
+            start_bot_initialization()
+    
     @app.route('/health', methods=['GET', 'HEAD'])
     def health():
         """Simple health check endpoint for uptime monitoring"""
+        # HEAD probes only need the status, answer before building any body
+        if request.method == 'HEAD':
+            return Response(status=200 if bot_instance is not None else 503)
+        
         if bot_instance is None:
             return "Bot not initialized", 503
-        return "OK", 200
+        return _HEALTH_OK
     
     @app.route('/health/detailed')
     def health_detailed():
         """Detailed health check endpoint for monitoring"""
-        global health_check_count
-        health_check_count += 1
-        
-        uptime_seconds = time.time() - start_time
-        uptime_hours = uptime_seconds / 3600
-        hours, remainder = divmod(int(uptime_seconds), 3600)
-        minutes, seconds = divmod(remainder, 60)
-        uptime_human = f"{hours}h {minutes}m {seconds}s" if hours > 0 else f"{minutes}m {seconds}s"
-        
-        return jsonify({
-            'status': 'healthy',
-            'service': 'telegram-claim-bot',
-            'timestamp': time.time(),
-            'uptime_seconds': uptime_seconds,
-            'uptime_hours': round(uptime_hours, 2),
-            'uptime_human': uptime_human,
-            'health_checks_total': health_check_count,
-            'monitoring_interval': '10_minutes',
-            'version': '1.0.0',
-            'deployment': 'render_production_gunicorn',
-            'telegram_bot_version': '13.15',
-            'wsgi_server': 'gunicorn'
-        }), 200
+        health_check_count = next(health_check_counter)
+        
+        # Probes only need the status line, skip building the body
+        if request.method == 'HEAD':
+            return Response(status=200, mimetype='application/json')
+        
+        now = time.monotonic()
+        if now >= _health_detailed_cache['expires']:
+            timestamp = time.time()
+            uptime_seconds = timestamp - start_time
+            uptime_hours = uptime_seconds / 3600
+            hours, remainder = divmod(int(uptime_seconds), 3600)
+            minutes, seconds = divmod(remainder, 60)
+            uptime_human = f"{hours}h {minutes}m {seconds}s" if hours > 0 else f"{minutes}m {seconds}s"
+            
+            # Encode only the changing fields and splice in the pre-encoded constant tail
+            _health_detailed_cache['body'] = json_dumps({
+                'timestamp': timestamp,
+                'uptime_seconds': uptime_seconds,
+                'uptime_hours': round(uptime_hours, 2),
+                'uptime_human': uptime_human,
+                'health_checks_total': health_check_count,
+                'webhook_set': webhook_set
+            })[:-1] + _HEALTH_STATIC_JSON_TAIL
+            _health_detailed_cache['expires'] = now + HEALTH_DETAILED_TTL
+        
+        # The body only changes when the cache is rebuilt, so repeat polls can be answered with 304
+        response = Response(_health_detailed_cache['body'], mimetype='application/json')
+        response.headers['Cache-Control'] = f'public, max-age={HEALTH_DETAILED_TTL}'
+        response.add_etag()
+        return response.make_conditional(request)
     
     @app.route('/', methods=['GET'])
     def index():
         """Root endpoint for direct access"""
-        return {"status": "OK", "message": "Pryme Claim Bot is running"}, 200
+        return _INDEX_RESPONSE
     
     @app.route('/', methods=['POST'])
     def webhook():
         """Handle incoming webhook updates from Telegram"""
         try:
-            if not bot_instance:
+            if dispatcher is None:
                 logger.error("Bot instance not initialized")
                 return 'Bot not ready', 503
             
-            update_data = request.get_json()
+            # Drop requests that didn't come from Telegram without reading the body.
+            # Compared as bytes, compare_digest raises TypeError for non-ASCII str arguments.
+            if webhook_secret_token and not hmac.compare_digest(
+                request.headers.get('X-Telegram-Bot-Api-Secret-Token', '').encode(), webhook_secret_token
+            ):
+                return '', 403
+            
+            raw_data = request.get_data(cache=False)
+            update_data = json_loads(raw_data) if raw_data else None
             if update_data:
-                # Create update object and process it
-                update = Update.de_json(update_data, bot_instance.updater.bot)
-                bot_instance.dispatcher.process_update(update)
+                from telegram import Update  # Already loaded by initialize_bot, this is a module cache lookup
+                
+                # Create update object and hand it to its chat's update worker
+                update = Update.de_json(update_data, telegram_bot)
+                
+                if not pending_updates.acquire(blocking=False):
+                    logger.warning("Update backlog full, asking Telegram to redeliver later")
+                    return '', 503
+                
+                try:
+                    _executor_for(update).submit(_process_update, update)
+                except Exception:
+                    pending_updates.release()
+                    raise
             
             return '', 200
         except Exception as e:
-            logger.error(f"Webhook processing error: {e}")
+            logger.error("Webhook processing error: %s", e)
             return '', 500
     
     @app.route('/status')
     def status():
         """Application status endpoint with memory monitoring"""
         status_data = {
-            'status': 'running',
+            **_STATUS_STATIC,
             'bot_initialized': bot_instance is not None,
-            'uptime_seconds': time.time() - start_time,
-            'server': 'gunicorn'
+            'webhook_set': webhook_set,
+            'uptime_seconds': time.time() - start_time
         }
         
         # Add basic memory information if available
         if bot_instance is not None:
             try:
-                import psutil
-                process = psutil.Process()
-                memory_mb = process.memory_info().rss / 1024 / 1024
                 status_data['memory'] = {
-                    'rss_mb': round(memory_mb, 2),
+                    'rss_mb': _sample_rss_mb(),
                     'available': True
                 }
             except Exception as e:
                 status_data['memory'] = {'error': str(e)}
         
-        return jsonify(status_data), 200
+        return json_response(status_data, max_age=5)
     
     @app.route('/memory')
     def memory_stats():
         """Dedicated memory monitoring endpoint"""
         if bot_instance is None:
-            return jsonify({'error': 'Bot not initialized'}), 503
+            return json_response({'error': 'Bot not initialized'}, 503)
         
         try:
-            import psutil
-            process = psutil.Process()
             memory_info = {
-                'rss_mb': round(process.memory_info().rss / 1024 / 1024, 2),
+                'rss_mb': _sample_rss_mb(),
                 'available': True,
                 'state_management': 'ConversationHandler (built-in)'
             }
-            return jsonify(memory_info), 200
+            return json_response(memory_info)
         except Exception as e:
-            return jsonify({'error': str(e)}), 500
+            return json_response({'error': str(e)}, 500)
+    
+    app.wsgi_app = _health_short_circuit(app.wsgi_app)
     
     return app
 
+def _set_webhook(bot_handler, url, max_connections, secret_token):
+    """
+    Register the webhook URL with Telegram, retrying with backoff until it succeeds.
+    
+    Without a webhook no updates arrive, so a transient Telegram or network failure at
+    startup must not leave the bot silently deaf. Progress shows as webhook_set.
+    """
+    global webhook_set
+    
+    delay = WEBHOOK_RETRY_INITIAL_DELAY
+    while True:
+        try:
+            bot_handler.start_webhook(url, max_connections=max_connections, secret_token=secret_token)
+            webhook_set = True
+            return
+        except Exception:
+            # Already logged by start_webhook
+            logger.warning("Retrying webhook registration in %d seconds", delay)
+            time.sleep(delay)
+            delay = min(delay * 2, WEBHOOK_RETRY_MAX_DELAY)
+
+_init_lock = threading.Lock()
+_init_started = False
+
+def start_bot_initialization():
+    """
+    Initialize the bot in a background thread so the worker can serve requests right away.
+    
+    Safe to call repeatedly, only the first call per process starts a thread. Until the bot
+    is ready /health and the webhook answer 503.
+    """
+    global _init_started
+    
+    with _init_lock:
+        if _init_started or bot_instance is not None:
+            return
+        _init_started = True
+    
+    threading.Thread(target=_initialize_bot_in_background, daemon=True, name="BotInit").start()
+
+def _initialize_bot_in_background():
+    """Run initialize_bot(), allowing a later request to retry if it fails"""
+    global _init_started
+    
+    try:
+        initialize_bot()
+    except Exception:
+        # Already logged by initialize_bot
+        with _init_lock:
+            _init_started = False
+
 def initialize_bot():
     """Initialize the Telegram bot instance with lazy loading"""
-    global bot_instance
+    global bot_instance, telegram_bot, dispatcher, webhook_secret_token
     
     try:
         from config import Config
@@ -143,15 +360,11 @@ def initialize_bot():
         
         logger.info("Initializing bot for Gunicorn deployment with lazy loading...")
         
-        # Memory monitoring - start
-        try:
-            import psutil
-            process = psutil.Process()
+        # Memory monitoring - start, current RSS through the already imported psutil handle
+        process = _get_process()
+        if process is not None:
             memory_start = process.memory_info().rss / 1024 / 1024
-            logger.info(f"[MEMORY] Bot initialization start: {memory_start:.2f} MB")
-        except ImportError:
-            memory_start = 0
-            logger.warning("psutil not available, memory monitoring disabled")
+            logger.info("[MEMORY] Bot initialization start: %.2f MB", memory_start)
         
         # Load configuration
         config = Config()
@@ -169,48 +382,49 @@ def initialize_bot():
             token=config.TELEGRAM_BOT_TOKEN,
             user_manager=user_manager,
             claims_manager=claims_manager,
-            dayoff_manager=dayoff_manager
+            dayoff_manager=dayoff_manager,
+            con_pool_size=config.TELEGRAM_CON_POOL_SIZE
         )
+        telegram_bot = bot_instance.updater.bot
+        webhook_secret_token = config.WEBHOOK_SECRET_TOKEN.encode() if config.WEBHOOK_SECRET_TOKEN else None
+        dispatcher = bot_instance.dispatcher
         
         # Note: ConversationHandler state is maintained in-memory and is not shared between workers
         # To prevent state loss during conversations, we use a single Gunicorn worker
         # See gunicorn.conf.py for worker configuration
         
-        # Set webhook if URL is provided
+        # Set webhook if URL is provided, off the startup path so the worker can accept traffic
         if config.WEBHOOK_URL:
-            bot_instance.updater.bot.set_webhook(url=config.WEBHOOK_URL)
-            logger.info(f"Webhook set to: {config.WEBHOOK_URL}")
+            threading.Thread(
+                target=_set_webhook,
+                args=(bot_instance, config.WEBHOOK_URL, config.WEBHOOK_MAX_CONNECTIONS, config.WEBHOOK_SECRET_TOKEN),
+                daemon=True,
+                name="SetWebhook"
+            ).start()
         
         # Memory monitoring - end
-        if memory_start > 0:
+        if process is not None:
             try:
                 memory_end = process.memory_info().rss / 1024 / 1024
                 memory_diff = memory_end - memory_start
-                logger.info(f"[MEMORY] Bot initialization end: {memory_end:.2f} MB (diff: {memory_diff:+.2f} MB)")
-                
-                # Force garbage collection
-                import gc
-                gc.collect()
-                memory_after_gc = process.memory_info().rss / 1024 / 1024
-                gc_freed = memory_end - memory_after_gc
-                logger.info(f"[MEMORY] After GC: {memory_after_gc:.2f} MB (GC freed: {gc_freed:.2f} MB)")
-                
+                logger.info("[MEMORY] Bot initialization end: %.2f MB (diff: %+.2f MB)", memory_end, memory_diff)
             except Exception as e:
-                logger.error(f"Error in memory monitoring: {e}")
+                logger.error("Error in memory monitoring: %s", e)
+        
+        # Move the long-lived objects built so far (modules, bot, managers) out of future GC passes
+        gc.freeze()
         
         logger.info("Bot initialized successfully with lazy loading - Google API clients will be loaded on demand")
         
     except Exception as e:
-        logger.error(f"Failed to initialize bot: {e}")
+        logger.error("Failed to initialize bot: %s", e)
         raise
 
 # Create Flask app
 app = create_app()
 
-# Initialize bot when module is imported
-if __name__ != '__main__':
-    # This runs when imported by Gunicorn
-    initialize_bot()
+# When imported by Gunicorn the bot is initialized in the background after the worker forks
+# (see post_fork in gunicorn.conf.py), or on the first request under other WSGI servers
 
 if __name__ == '__main__':
     # This runs when executed directly (for testing)
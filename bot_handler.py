@@ -4,7 +4,6 @@ Handles Telegram webhook/polling and message routing with ConversationHandler
 """
 
 import logging
-import gc
 from typing import Optional
 from telegram import Update, Bot
 from telegram.ext import (
@@ -12,6 +11,7 @@ from telegram.ext import (
     ConversationHandler, Filters
 )
 from telegram import ParseMode
+from telegram.error import BadRequest
 from datetime import datetime  # Added for date parsing in dayoff handlers
 
 from user_manager import UserManager
@@ -23,19 +23,98 @@ from conversation_states import *
 
 logger = logging.getLogger(__name__)
 
-try:
-    import psutil
-    PSUTIL_AVAILABLE = True
-except ImportError:
-    PSUTIL_AVAILABLE = False
-    logger.warning("psutil not available, memory monitoring disabled")
+# Update types the handlers below act on, Telegram doesn't deliver (or we parse) anything else
+ALLOWED_UPDATES = ['message', 'callback_query']
+
+# Role callback data to the role name stored in Google Sheets
+_ROLE_MAPPING = {
+    'role_staff': 'Staff',
+    'role_manager': 'Manager',
+    'role_ambassador': 'Ambassador'
+}
+
+# Feedback shown while slow operations run, keyed by operation type
+_PROCESSING_MESSAGES = {
+    'upload': "📤 <b>Uploading...</b>\n\nProcessing your receipt photo, please wait...\n⏳ <i>Please do not click other buttons</i>",
+    'save': "💾 <b>Saving...</b>\n\nSaving your information to the system...\n⏳ <i>Please wait, do not click other buttons</i>",
+    'submit': "📋 <b>Submitting...</b>\n\nSubmitting your request to the system...\n⏳ <i>Please wait, do not click other buttons</i>",
+    'dayoff_submit': "📅 <b>Submitting...</b>\n\nSubmitting your day-off request to the system...\n⏳ <i>Please wait, do not click other buttons</i>"
+}
+
+# /start welcome text, only the user's display name is filled in per call
+_START_MESSAGE_TEMPLATE = (
+    "<b>🎉 Welcome to PRYME PLUS Bot!</b>\n\n"
+    "Hey there, <b>{display_name}</b>! 👋 Great to see you here!\n\n"
+    "I'm your <b>PRYMEPLUS Claim Assistant</b>, ready to make your claim process easier! 💼✨\n\n"
+    "<b>📋 Available Commands:</b>\n"
+    "• /register - Register your information 📝\n"
+    "• /claim - Submit your expense claim 💰\n"
+    "• /help - View help information ℹ️\n"
+    "• /dayoff - Request Day-off 🗓️\n\n"
+    "<b>🚀 Let's get started!</b>"
+)
+
+# Registration success text, filled in with the saved details
+_REGISTRATION_COMPLETE_TEMPLATE = (
+    "✅ <b>Registration completed successfully!</b>\n\n"
+    "👤 Name: {name}\n"
+    "📱 Phone: {phone}\n"
+    "🏢 Role: {role}\n\n"
+    "You can now use all bot features!"
+)
+
+# Static /help text, built once at import
+_HELP_MESSAGE = (
+    "📋 <b>PRYMEPLUS System Help</b>\n\n"
+    "<b>Available Commands:</b>\n"
+    "• /start - Start using the system\n"
+    "• /register - Register user information\n"
+    "• /claim - Submit expense claim\n"
+    "• /dayoff - Request Day-off 🗓️\n"
+    "• /help - Show this help information\n\n"
+    "<b>Usage Flow:</b>\n"
+    "1. Use /register to register your information\n"
+    "2. Use /claim to submit expense claim\n"
+    "3. Use /dayoff to request day-off (Staff & Manager only)\n"
+    "4. Select category, enter amount, upload receipt\n"
+    "5. Confirm and submit claim\n\n"
+    "<b>Supported Expense Categories:</b>\n"
+    "• 🍔 Food - Food expenses\n"
+    "• 🚗 Transportation - Transportation costs\n"
+    "• ✈️ Flight - Flight expenses\n"
+    "• 🎉 Event - Event costs\n"
+    "• 🤖 AI - AI tool expenses\n"
+    "• 🎪 Reception - Reception expenses\n"
+    "• 📦 Other - Other expenses\n\n"
+    "<b>Day-off Request:</b>\n"
+    "• Available for Staff and Manager roles only\n"
+    "• Use DD/MM/YYYY date format\n"
+    "• Provide clear reason for request\n\n"
+    "If you have any questions, please contact the administrator."
+)
+
+# Telegram's answer when an edit would leave the message exactly as it is
+_NOT_MODIFIED_ERROR = 'message is not modified'
+
+# Reply to text sent outside any conversation
+_FALLBACK_MESSAGE = (
+    "Please use one of the following commands:\n"
+    "• /register - Register your information\n"
+    "• /claim - Submit expense claim\n"
+    "• /help - View help information\n"
+    "• /dayoff - Request day-off"
+)
 
 
 class TelegramBot:
     """Main Telegram Bot handler class for v13.15 with ConversationHandler"""
     
+    __slots__ = ('token', 'user_manager', 'claims_manager', 'dayoff_manager',
+                 'error_handler', 'updater', 'dispatcher')
+    
     def __init__(self, token: str, user_manager: UserManager, claims_manager: ClaimsManager, 
-                 dayoff_manager: DayOffManager):
+                 dayoff_manager: DayOffManager, con_pool_size: int = 16,
+                 connect_timeout: float = 10.0, read_timeout: float = 30.0):
         """
         Initialize bot with token and required managers
         
@@ -44,6 +123,9 @@ class TelegramBot:
             user_manager: User management instance
             claims_manager: Claims management instance
             dayoff_manager: Day-off management instance
+            con_pool_size: Connections kept to the Bot API, should cover concurrently running handlers
+            connect_timeout: Seconds to wait when connecting to the Bot API
+            read_timeout: Seconds to wait for a Bot API response
         """
         self.token = token
         self.user_manager = user_manager
@@ -52,7 +134,17 @@ class TelegramBot:
         self.error_handler = global_error_handler
         
         # Create updater and dispatcher (v13.15 style)
-        self.updater = Updater(token=token, use_context=True)
+        # The default pool (dispatcher workers + 4) is sized for polling, webhook updates are handled
+        # by several threads at once which would otherwise queue for a connection
+        self.updater = Updater(
+            token=token,
+            use_context=True,
+            request_kwargs={
+                'con_pool_size': con_pool_size,
+                'connect_timeout': connect_timeout,
+                'read_timeout': read_timeout
+            }
+        )
         self.dispatcher = self.updater.dispatcher
         
         # Setup handlers
@@ -60,53 +152,6 @@ class TelegramBot:
         
         logger.info("TelegramBot initialized with ConversationHandler")
     
-    def _log_memory_usage(self, operation: str, stage: str) -> float:
-        """
-        Log current memory usage for monitoring
-        
-        Args:
-            operation: Operation name (e.g., '/start', '/claim')
-            stage: Stage of operation (e.g., 'begin', 'end', 'after_gc')
-            
-        Returns:
-            Current memory usage in MB
-        """
-        if not PSUTIL_AVAILABLE:
-            return 0.0
-        
-        try:
-            process = psutil.Process()
-            memory_mb = process.memory_info().rss / 1024 / 1024
-            logger.info(f"[MEMORY] {operation} {stage}: {memory_mb:.2f} MB")
-            return memory_mb
-        except Exception as e:
-            logger.error(f"Error getting memory usage: {e}")
-            return 0.0
-    
-    def _cleanup_and_monitor_memory(self, operation: str, objects_to_clean: list = None) -> None:
-        """
-        Clean up objects and monitor memory usage
-        
-        Args:
-            operation: Operation name for logging
-            objects_to_clean: List of objects to delete
-        """
-        try:
-            # Clean up specified objects
-            if objects_to_clean:
-                for obj in objects_to_clean:
-                    if obj is not None:
-                        del obj
-            
-            # Force garbage collection
-            gc.collect()
-            
-            # Log memory after cleanup
-            self._log_memory_usage(operation, "after_cleanup")
-            
-        except Exception as e:
-            logger.error(f"Error in memory cleanup for {operation}: {e}")
-    
     def _send_processing_message(self, update_or_query, message_type: str, custom_message: str = None):
         """
         Send a processing message to provide user feedback during long operations
@@ -119,15 +164,7 @@ class TelegramBot:
         Returns:
             Message object for later deletion (if applicable)
         """
-        # Default messages for different operation types
-        default_messages = {
-            'upload': "📤 <b>Uploading...</b>\n\nProcessing your receipt photo, please wait...\n⏳ <i>Please do not click other buttons</i>",
-            'save': "💾 <b>Saving...</b>\n\nSaving your information to the system...\n⏳ <i>Please wait, do not click other buttons</i>",
-            'submit': "📋 <b>Submitting...</b>\n\nSubmitting your request to the system...\n⏳ <i>Please wait, do not click other buttons</i>",
-            'dayoff_submit': "📅 <b>Submitting...</b>\n\nSubmitting your day-off request to the system...\n⏳ <i>Please wait, do not click other buttons</i>"
-        }
-        
-        message_text = custom_message or default_messages.get(message_type, default_messages['submit'])
+        message_text = custom_message or _PROCESSING_MESSAGES.get(message_type, _PROCESSING_MESSAGES['submit'])
         
         try:
             # Check if it's a CallbackQuery (inline keyboard response)
@@ -145,7 +182,7 @@ class TelegramBot:
                     parse_mode=ParseMode.HTML
                 )
         except Exception as e:
-            logger.warning(f"Could not send processing message: {e}")
+            logger.warning("Could not send processing message: %s", e)
             return None
     
     def _delete_processing_message(self, message):
@@ -159,7 +196,7 @@ class TelegramBot:
             try:
                 message.delete()
             except Exception as e:
-                logger.warning(f"Could not delete processing message: {e}")
+                logger.warning("Could not delete processing message: %s", e)
     
     def _setup_handlers(self):
         """Setup all message and callback handlers with ConversationHandler"""
@@ -180,6 +217,7 @@ class TelegramBot:
                 CallbackQueryHandler(self.cancel_register, pattern='^cancel$')
             ],
             name="registration",
+            per_message=False,  # Entry points and states mix commands, text and callbacks; track per chat/user
             persistent=False  # In-memory state only, requires single worker to maintain state
                              # For multi-worker setup, would need persistent=True with BasePersistence implementation
         )
@@ -188,7 +226,7 @@ class TelegramBot:
         claim_handler = ConversationHandler(
             entry_points=[
                 CommandHandler('claim', self.start_claim),
-                CallbackQueryHandler(self.start_claim, pattern='^start_claim$')
+                CallbackQueryHandler(self.start_claim, pattern='^(start_claim|new_claim)$')
             ],
             states={
                 CLAIM_CATEGORY: [CallbackQueryHandler(self.claim_category, pattern='^category_')],
@@ -202,6 +240,7 @@ class TelegramBot:
                 CallbackQueryHandler(self.cancel_claim, pattern='^cancel$')
             ],
             name="claim",
+            per_message=False,
             persistent=False
         )
         
@@ -227,6 +266,7 @@ class TelegramBot:
                 CallbackQueryHandler(self.cancel_dayoff, pattern='^cancel$')
             ],
             name="dayoff",
+            per_message=False,
             persistent=False
         )
         self.dispatcher.add_handler(dayoff_handler)
@@ -237,7 +277,7 @@ class TelegramBot:
         # Remove CommandHandler for dayoff since it's now handled by ConversationHandler
         # self.dispatcher.add_handler(CommandHandler("dayoff", self.handle_dayoff_command))
         
-        # General callback handler for non-conversation callbacks
+        # Catch-all for stale buttons, every known callback is routed by its handler's pattern above
         self.dispatcher.add_handler(CallbackQueryHandler(self.handle_general_callback))
         
         # Fallback message handler
@@ -248,7 +288,8 @@ class TelegramBot:
         
         logger.info("Bot handlers setup complete with ConversationHandler")    
 
-    def start_webhook(self, webhook_url: str, port: int = 8000):
+    def start_webhook(self, webhook_url: str, port: int = 8000, max_connections: int = 40,
+                      secret_token: Optional[str] = None):
         """
         Set webhook for production deployment (v13.15 style)
         Note: Flask server is now handled separately by Gunicorn
@@ -256,49 +297,49 @@ class TelegramBot:
         Args:
             webhook_url: URL for webhook
             port: Port to listen on (unused, kept for compatibility)
+            max_connections: Parallel HTTPS connections Telegram may open to deliver updates
+            secret_token: Optional secret Telegram sends back in the X-Telegram-Bot-Api-Secret-Token header
         """
         try:
-            logger.info(f"Setting webhook to {webhook_url}")
+            logger.info("Setting webhook to %s", webhook_url)
             
             # Set webhook
-            self.updater.bot.set_webhook(url=webhook_url)
-            logger.info(f"Webhook set successfully to: {webhook_url}")
+            self.updater.bot.set_webhook(
+                url=webhook_url,
+                max_connections=max_connections,
+                allowed_updates=ALLOWED_UPDATES,
+                api_kwargs={'secret_token': secret_token} if secret_token else None
+            )
+            logger.info("Webhook set successfully to: %s", webhook_url)
             logger.info("Flask server will be handled by Gunicorn")
             
         except Exception as e:
-            logger.error(f"Failed to set webhook: {e}")
+            logger.error("Failed to set webhook: %s", e)
             raise
     
     def start_polling(self):
-        """Start polling for development (v13.15 style)"""
+        """Start polling for development (v13.15 style), production uses the webhook"""
         try:
-            logger.info("Starting polling mode")
+            logger.warning("Starting polling mode - intended for development only, set WEBHOOK_URL in production")
             
             # Start polling (v13.15 style)
-            self.updater.start_polling()
+            self.updater.start_polling(allowed_updates=ALLOWED_UPDATES)
             
             # Keep running
             self.updater.idle()
             
         except Exception as e:
-            logger.error(f"Failed to start polling: {e}")
+            logger.error("Failed to start polling: %s", e)
             raise
     
     def handle_start_command(self, update: Update, context):
-        """Handle /start command with optimized memory management"""
-        # Memory monitoring - start
-        memory_start = self._log_memory_usage("/start", "begin")
-        
-        user_data = None
-        keyboard = None
-        
+        """Handle /start command"""
         try:
-            user_id = update.effective_user.id
-            telegram_name = update.effective_user.first_name or "User"
-            
-            logger.info(f"User {user_id} ({telegram_name}) started bot")
+            user = update.effective_user
+            user_id = user.id
+            telegram_name = user.first_name or "User"
             
-            # Skip memory cleanup to avoid triggering unnecessary operations
+            logger.info("User %s (%s) started bot", user_id, telegram_name)
             
             # Ultra-optimized approach: For /start, use universal keyboard without API calls
             # Registration status will be checked when user tries to use specific features
@@ -306,39 +347,19 @@ class TelegramBot:
             keyboard = KeyboardBuilder.universal_start_keyboard()
             
             # Log that we're using zero-API approach for /start
-            logger.info(f"User {user_id} ({telegram_name}) accessed /start - zero Google API calls")
+            logger.info("User %s (%s) accessed /start - zero Google API calls", user_id, telegram_name)
             
             # Optimized welcome message with HTML format and emojis
-            message = (
-                f"<b>🎉 Welcome to PRYME PLUS Bot!</b>\n\n"
-                f"Hey there, <b>{display_name}</b>! 👋 Great to see you here!\n\n"
-                f"I'm your <b>PRYMEPLUS Claim Assistant</b>, ready to make your claim process easier! 💼✨\n\n"
-                f"<b>📋 Available Commands:</b>\n"
-                f"• /register - Register your information 📝\n"
-                f"• /claim - Submit your expense claim 💰\n"
-                f"• /help - View help information ℹ️\n"
-                f"• /dayoff - Request Day-off 🗓️\n\n"
-                f"<b>🚀 Let's get started!</b>"
-            )
+            message = _START_MESSAGE_TEMPLATE.format(display_name=display_name)
             
-            update.message.reply_text(
+            update.message.reply_html(
                 message,
-                reply_markup=keyboard,
-                parse_mode=ParseMode.HTML
+                reply_markup=keyboard
             )
             
-            # Memory monitoring - end
-            memory_end = self._log_memory_usage("/start", "end")
-            if PSUTIL_AVAILABLE and memory_start > 0:
-                memory_diff = memory_end - memory_start
-                logger.info(f"[MEMORY] /start memory diff: {memory_diff:+.2f} MB")
-            
         except Exception as e:
-            logger.error(f"Error handling start command: {e}")
+            logger.error("Error handling start command: %s", e)
             self._send_error_message(update, "Failed to process start command, please try again later.")
-        finally:
-            # Clean up and monitor memory
-            self._cleanup_and_monitor_memory("/start", [user_data, keyboard])
     
     # ==================== REGISTRATION CONVERSATION HANDLERS ====================
     
@@ -346,39 +367,19 @@ class TelegramBot:
         """Start registration conversation"""
         user_id = update.effective_user.id
         
-        logger.info(f"User {user_id} started registration")
+        logger.info("User %s started registration", user_id)
         
         # Check if user is already registered
         if self.user_manager.is_user_registered(user_id):
             message = "✅ You are already registered! You can now use all bot features."
             
-            if update.callback_query:
-                update.callback_query.answer()
-                update.callback_query.edit_message_text(
-                    message,
-                    reply_markup=KeyboardBuilder.start_claim_keyboard()
-                )
-            else:
-                update.message.reply_text(
-                    message,
-                    reply_markup=KeyboardBuilder.start_claim_keyboard()
-                )
+            self._reply(update, message, reply_markup=KeyboardBuilder.start_claim_keyboard())
             return ConversationHandler.END
         
         # Start registration process
         message = "📝 Welcome to PRYMEPLUS Registration!\n\nPlease enter your REAL NAME 👤:"
         
-        if update.callback_query:
-            update.callback_query.answer()
-            update.callback_query.edit_message_text(
-                message,
-                reply_markup=KeyboardBuilder.cancel_keyboard()
-            )
-        else:
-            update.message.reply_text(
-                message,
-                reply_markup=KeyboardBuilder.cancel_keyboard()
-            )
+        self._reply(update, message, reply_markup=KeyboardBuilder.cancel_keyboard())
         
         return REGISTER_NAME
     
@@ -387,7 +388,7 @@ class TelegramBot:
         user_id = update.effective_user.id
         name = update.message.text.strip()
         
-        logger.info(f"User {user_id} provided name: {name[:20]}...")
+        logger.info("User %s provided name: %.20s...", user_id, name)
         
         # Validate name
         result = self.user_manager.process_registration_step(user_id, 'name', name)
@@ -416,7 +417,7 @@ class TelegramBot:
         user_id = update.effective_user.id
         phone = update.message.text.strip()
         
-        logger.info(f"User {user_id} provided phone: {phone[:10]}...")
+        logger.info("User %s provided phone: %.10s...", user_id, phone)
         
         # Validate phone
         result = self.user_manager.process_registration_step(user_id, 'phone', phone)
@@ -449,13 +450,7 @@ class TelegramBot:
         query.answer()
         
         # Extract role from callback data
-        role_mapping = {
-            'role_staff': 'Staff',
-            'role_manager': 'Manager',
-            'role_ambassador': 'Ambassador'
-        }
-        
-        role = role_mapping.get(role_data)
+        role = _ROLE_MAPPING.get(role_data)
         if not role:
             query.edit_message_text(
                 "❌ Invalid role selection. Please try again:",
@@ -463,7 +458,7 @@ class TelegramBot:
             )
             return REGISTER_ROLE
         
-        logger.info(f"User {user_id} selected role: {role}")
+        logger.info("User %s selected role: %s", user_id, role)
         
         # Get registration data from context
         name = context.user_data.get('name')
@@ -486,11 +481,7 @@ class TelegramBot:
         if success:
             # Registration completed successfully
             query.edit_message_text(
-                f"✅ <b>Registration completed successfully!</b>\n\n"
-                f"👤 Name: {name}\n"
-                f"📱 Phone: {phone}\n"
-                f"🏢 Role: {role}\n\n"
-                f"You can now use all bot features!",
+                _REGISTRATION_COMPLETE_TEMPLATE.format(name=name, phone=phone, role=role),
                 reply_markup=KeyboardBuilder.start_claim_keyboard(),
                 parse_mode=ParseMode.HTML
             )
@@ -511,21 +502,11 @@ class TelegramBot:
     def cancel_register(self, update: Update, context):
         """Cancel registration conversation"""
         user_id = update.effective_user.id
-        logger.info(f"User {user_id} cancelled registration")
+        logger.info("User %s cancelled registration", user_id)
         
         message = "❌ Registration cancelled. You can start again anytime with /register"
         
-        if update.callback_query:
-            update.callback_query.answer()
-            update.callback_query.edit_message_text(
-                message,
-                reply_markup=KeyboardBuilder.register_now_keyboard()
-            )
-        else:
-            update.message.reply_text(
-                message,
-                reply_markup=KeyboardBuilder.register_now_keyboard()
-            )
+        self._reply(update, message, reply_markup=KeyboardBuilder.register_now_keyboard())
         
         # Clear context data
         context.user_data.clear()
@@ -538,7 +519,7 @@ class TelegramBot:
         """Start claim conversation"""
         user_id = update.effective_user.id
         
-        logger.info(f"User {user_id} started claim process")
+        logger.info("User %s started claim process", user_id)
         
         # Check if user is registered
         has_permission, error_msg = self.user_manager.check_user_permission(user_id)
@@ -546,33 +527,13 @@ class TelegramBot:
         if not has_permission:
             message = error_msg
             
-            if update.callback_query:
-                update.callback_query.answer()
-                update.callback_query.edit_message_text(
-                    message,
-                    reply_markup=KeyboardBuilder.register_now_keyboard()
-                )
-            else:
-                update.message.reply_text(
-                    message,
-                    reply_markup=KeyboardBuilder.register_now_keyboard()
-                )
+            self._reply(update, message, reply_markup=KeyboardBuilder.register_now_keyboard())
             return ConversationHandler.END
         
         # Start claim process
         message = "💰 Welcome to PRYMEPLUS Claim System!\n\nPlease select expense category:"
         
-        if update.callback_query:
-            update.callback_query.answer()
-            update.callback_query.edit_message_text(
-                message,
-                reply_markup=KeyboardBuilder.claim_categories_keyboard()
-            )
-        else:
-            update.message.reply_text(
-                message,
-                reply_markup=KeyboardBuilder.claim_categories_keyboard()
-            )
+        self._reply(update, message, reply_markup=KeyboardBuilder.claim_categories_keyboard())
         
         # Initialize claim data in context
         context.user_data['claim_data'] = {}
@@ -587,7 +548,7 @@ class TelegramBot:
         
         query.answer()
         
-        logger.info(f"User {user_id} selected category: {category_data}")
+        logger.info("User %s selected category: %s", user_id, category_data)
         
         # Process category selection
         result = self.claims_manager._process_category_selection(user_id, category_data)
@@ -614,7 +575,7 @@ class TelegramBot:
         user_id = update.effective_user.id
         amount_text = update.message.text.strip()
         
-        logger.info(f"User {user_id} entered amount: {amount_text}")
+        logger.info("User %s entered amount: %s", user_id, amount_text)
         
         # Get category from context
         category = context.user_data['claim_data'].get('category', '')
@@ -653,14 +614,13 @@ class TelegramBot:
         user_id = update.effective_user.id
         description = update.message.text.strip()
         
-        logger.info(f"User {user_id} provided other description: {description[:30]}...")
+        logger.info("User %s provided other description: %.30s...", user_id, description)
         
         # Process description
         result = self.claims_manager._process_other_description_input(user_id, description)
         
         if result['success']:
-            # Store description in context and update category
-            context.user_data['claim_data']['other_description'] = result.get('description', description)
+            # Fold the description into the category, the only place it is read from
             context.user_data['claim_data']['category'] = f"Other : {result.get('description', description)}"
             
             update.message.reply_text(
@@ -681,7 +641,7 @@ class TelegramBot:
         """Handle photo upload in claim"""
         user_id = update.effective_user.id
         
-        logger.info(f"User {user_id} uploaded photo")
+        logger.info("User %s uploaded photo", user_id)
         
         # Send immediate "uploading" message to provide user feedback
         uploading_message = self._send_processing_message(update, 'upload')
@@ -696,7 +656,8 @@ class TelegramBot:
             claim_data = context.user_data.get('claim_data', {})
             
             # Process photo upload
-            result = self.claims_manager._process_photo_upload(user_id, bytes(photo_data), claim_data)
+            # The bytearray is passed as is, validation and the Drive upload only need a buffer
+            result = self.claims_manager._process_photo_upload(user_id, photo_data, claim_data)
             
             # Delete the "uploading" message
             self._delete_processing_message(uploading_message)
@@ -724,7 +685,7 @@ class TelegramBot:
             # Delete the "uploading" message in case of error
             self._delete_processing_message(uploading_message)
             
-            logger.error(f"Error processing photo upload for user {user_id}: {e}")
+            logger.error("Error processing photo upload for user %s: %s", user_id, e)
             update.message.reply_text(
                 "❌ Photo upload failed, please try uploading the receipt photo again",
                 reply_markup=KeyboardBuilder.cancel_keyboard()
@@ -739,7 +700,7 @@ class TelegramBot:
         
         query.answer()
         
-        logger.info(f"User {user_id} claim confirmation: {confirm_data}")
+        logger.info("User %s claim confirmation: %s", user_id, confirm_data)
         
         # Only show processing message for "Yes" confirmation
         if confirm_data == "confirm_yes":
@@ -766,21 +727,11 @@ class TelegramBot:
     def cancel_claim(self, update: Update, context):
         """Cancel claim conversation"""
         user_id = update.effective_user.id
-        logger.info(f"User {user_id} cancelled claim")
+        logger.info("User %s cancelled claim", user_id)
         
         message = "❌ Claim process cancelled. You can start again anytime with /claim"
         
-        if update.callback_query:
-            update.callback_query.answer()
-            update.callback_query.edit_message_text(
-                message,
-                reply_markup=KeyboardBuilder.start_claim_keyboard()
-            )
-        else:
-            update.message.reply_text(
-                message,
-                reply_markup=KeyboardBuilder.start_claim_keyboard()
-            )
+        self._reply(update, message, reply_markup=KeyboardBuilder.start_claim_keyboard())
         
         # Clear context data
         context.user_data.clear()
@@ -790,42 +741,10 @@ class TelegramBot:
     def handle_help_command(self, update: Update, context):
         """Handle /help command"""
         try:
-            help_message = (
-                "📋 <b>PRYMEPLUS System Help</b>\n\n"
-                "<b>Available Commands:</b>\n"
-                "• /start - Start using the system\n"
-                "• /register - Register user information\n"
-                "• /claim - Submit expense claim\n"
-                "• /dayoff - Request Day-off 🗓️\n"
-                "• /help - Show this help information\n\n"
-                "<b>Usage Flow:</b>\n"
-                "1. Use /register to register your information\n"
-                "2. Use /claim to submit expense claim\n"
-                "3. Use /dayoff to request day-off (Staff & Manager only)\n"
-                "4. Select category, enter amount, upload receipt\n"
-                "5. Confirm and submit claim\n\n"
-                "<b>Supported Expense Categories:</b>\n"
-                "• 🍔 Food - Food expenses\n"
-                "• 🚗 Transportation - Transportation costs\n"
-                "• ✈️ Flight - Flight expenses\n"
-                "• 🎉 Event - Event costs\n"
-                "• 🤖 AI - AI tool expenses\n"
-                "• 🎪 Reception - Reception expenses\n"
-                "• 📦 Other - Other expenses\n\n"
-                "<b>Day-off Request:</b>\n"
-                "• Available for Staff and Manager roles only\n"
-                "• Use DD/MM/YYYY date format\n"
-                "• Provide clear reason for request\n\n"
-                "If you have any questions, please contact the administrator."
-            )
-            
-            update.message.reply_text(
-                help_message,
-                parse_mode=ParseMode.HTML
-            )
+            update.message.reply_html(_HELP_MESSAGE)
             
         except Exception as e:
-            logger.error(f"Error handling help command: {e}")
+            logger.error("Error handling help command: %s", e)
             self._send_error_message(update, "Failed to get help information, please try again later.")
     
     # Remove handle_dayoff_command since /dayoff is now entry point of ConversationHandler
@@ -855,30 +774,21 @@ class TelegramBot:
         """Start day-off conversation"""
         user_id = update.effective_user.id
         
-        logger.info(f"User {user_id} started day-off request")
+        logger.info("User %s started day-off request", user_id)
         
         result = self.dayoff_manager.start_dayoff_request(user_id)
         
         message = result['message']
         keyboard = result.get('keyboard')
         
-        if update.callback_query:
-            update.callback_query.answer()
-            update.callback_query.edit_message_text(
-                message,
-                reply_markup=keyboard,
-                parse_mode=ParseMode.HTML
-            )
-        else:
-            update.message.reply_text(
-                message,
-                reply_markup=keyboard,
-                parse_mode=ParseMode.HTML
-            )
+        self._reply(update, message, reply_markup=keyboard, parse_mode=ParseMode.HTML)
         
         if not result['success']:
             return ConversationHandler.END
         
+        # Keep the name found by the permission check so submitting needs no second lookup
+        context.user_data['dayoff_user_name'] = result.get('user_name')
+        
         return DAYOFF_TYPE
     
     def dayoff_type(self, update: Update, context):
@@ -888,10 +798,10 @@ class TelegramBot:
         
         query.answer()
         
-        dayoff_type = type_data.split('_')[-1]  # oneday or multiday
+        dayoff_type = type_data[len('dayoff_type_'):]  # oneday or multiday
         context.user_data['dayoff_type'] = dayoff_type
         
-        logger.info(f"User {user_id} selected day-off type: {dayoff_type}")
+        logger.info("User %s selected day-off type: %s", user_id, dayoff_type)
         
         if dayoff_type == 'oneday':
             message = "Please enter the date for your day-off (DD/MM/YYYY):"
@@ -910,7 +820,7 @@ class TelegramBot:
         user_id = update.effective_user.id
         date_str = update.message.text.strip()
         
-        logger.info(f"User {user_id} provided day-off date: {date_str}")
+        logger.info("User %s provided day-off date: %s", user_id, date_str)
         
         is_valid, error_msg = self.dayoff_manager.validate_date_format(date_str)
         if not is_valid:
@@ -932,7 +842,7 @@ class TelegramBot:
         user_id = update.effective_user.id
         date_str = update.message.text.strip()
         
-        logger.info(f"User {user_id} provided start date: {date_str}")
+        logger.info("User %s provided start date: %s", user_id, date_str)
         
         is_valid, error_msg = self.dayoff_manager.validate_date_format(date_str)
         if not is_valid:
@@ -955,7 +865,7 @@ class TelegramBot:
         end_date = update.message.text.strip()
         start_date = context.user_data.get('start_date')
         
-        logger.info(f"User {user_id} provided end date: {end_date}")
+        logger.info("User %s provided end date: %s", user_id, end_date)
         
         is_valid, error_msg = self.dayoff_manager.validate_date_format(end_date)
         if not is_valid:
@@ -987,7 +897,7 @@ class TelegramBot:
         user_id = update.effective_user.id
         reason = update.message.text.strip()
         
-        logger.info(f"User {user_id} provided reason: {reason[:20]}...")
+        logger.info("User %s provided reason: %.20s...", user_id, reason)
         
         is_valid, error_msg = self.dayoff_manager.validate_reason(reason)
         if not is_valid:
@@ -1003,7 +913,10 @@ class TelegramBot:
         # Send "submitting" message to provide user feedback
         submitting_message = self._send_processing_message(update, 'dayoff_submit')
         
-        success = self.dayoff_manager.save_dayoff_request(user_id, dayoff_type, dayoff_date, reason)
+        success = self.dayoff_manager.save_dayoff_request(
+            user_id, dayoff_type, dayoff_date, reason,
+            user_name=context.user_data.get('dayoff_user_name')
+        )
         
         # Delete the "submitting" message
         self._delete_processing_message(submitting_message)
@@ -1025,64 +938,48 @@ class TelegramBot:
     def cancel_dayoff(self, update: Update, context):
         """Cancel day-off conversation"""
         user_id = update.effective_user.id
-        logger.info(f"User {user_id} cancelled day-off request")
+        logger.info("User %s cancelled day-off request", user_id)
         
         message = "❌ Day-off request cancelled. You can start again with /dayoff"
         
-        if update.callback_query:
-            update.callback_query.answer()
-            update.callback_query.edit_message_text(
-                message,
-                reply_markup=KeyboardBuilder.universal_start_keyboard()
-            )
-        else:
-            update.message.reply_text(
-                message,
-                reply_markup=KeyboardBuilder.universal_start_keyboard()
-            )
+        self._reply(update, message, reply_markup=KeyboardBuilder.universal_start_keyboard())
         
         context.user_data.clear()
         return ConversationHandler.END
 
     def handle_general_callback(self, update: Update, context):
-        """Handle general callbacks not handled by ConversationHandler"""
+        """Handle callbacks not matched by any ConversationHandler pattern"""
         query = update.callback_query
-        callback_data = query.data
         
         query.answer()
         
-        logger.info(f"General callback: {callback_data}")
+        logger.info("General callback: %s", query.data)
         
-        if callback_data == 'new_claim':
-            # Start new claim
-            query.edit_message_text(
-                "💰 Starting new claim process...\n\nPlease select expense category:",
-                reply_markup=KeyboardBuilder.claim_categories_keyboard()
-            )
-        else:
-            query.edit_message_text("Unknown operation, please use the menu buttons.")
+        query.edit_message_text("Unknown operation, please use the menu buttons.")
     
     def handle_fallback_message(self, update: Update, context):
         """Handle messages not in any conversation"""
-        update.message.reply_text(
-            "Please use one of the following commands:\n"
-            "• /register - Register your information\n"
-            "• /claim - Submit expense claim\n"
-            "• /help - View help information\n"
-            "• /dayoff - Request day-off"
-        )
+        update.message.reply_text(_FALLBACK_MESSAGE)
     
     def handle_error(self, update: Update, context):
         """Handle errors with comprehensive error handling"""
         error = context.error
-        user_id = update.effective_user.id if update and update.effective_user else None
+        
+        # A repeated tap re-sending the same edit is harmless, don't report it to the user
+        if isinstance(error, BadRequest) and _NOT_MODIFIED_ERROR in str(error).lower():
+            logger.debug("Ignoring unchanged message edit: %s", error)
+            return
+        
+        error_handler = self.error_handler
+        user = update.effective_user if update else None
+        user_id = user.id if user else None
         
         # Log error details
-        self.error_handler.log_error_details(error, "telegram_bot_handler", user_id)
+        error_handler.log_error_details(error, "telegram_bot_handler", user_id)
         
         # Classify error and get user-friendly message
-        error_type, error_severity = self.error_handler.classify_error(error)
-        user_message = self.error_handler.get_user_friendly_message(error_type, error_severity, "bot_operation")
+        error_type, error_severity = error_handler.classify_error(error)
+        user_message = error_handler.get_user_friendly_message(error_type, error_severity, "bot_operation")
         
         # Send error message to user
         if update and update.effective_message:
@@ -1091,34 +988,27 @@ class TelegramBot:
         # ConversationHandler will automatically handle state cleanup on errors
         # No manual state clearing needed
     
+    def _reply(self, update: Update, text: str, reply_markup=None, parse_mode=None):
+        """Edit the message behind a callback query, or reply to a plain message"""
+        query = update.callback_query
+        if query:
+            query.answer()
+            return query.edit_message_text(text, reply_markup=reply_markup, parse_mode=parse_mode)
+        return update.message.reply_text(text, reply_markup=reply_markup, parse_mode=parse_mode)
+    
     def _send_error_message(self, update: Update, message: str):
         """Send error message to user"""
         try:
-            if update.message:
-                update.message.reply_text(message)
-            elif update.callback_query:
-                update.callback_query.message.reply_text(message)
+            # effective_message covers both plain messages and the message behind a callback query
+            message_obj = update.effective_message
+            if message_obj:
+                message_obj.reply_text(message)
         except Exception as e:
-            logger.error(f"Failed to send error message: {e}")
+            logger.error("Failed to send error message: %s", e)
     
     def _send_callback_error(self, query, message: str):
         """Send error message for callback query"""
         try:
             query.answer(message, show_alert=True)
         except Exception as e:
-            logger.error(f"Failed to send callback error: {e}")
-    
-    def _safe_edit_message(self, query, text: str, reply_markup=None):
-        """Safely edit message text"""
-        try:
-            query.edit_message_text(
-                text=text,
-                reply_markup=reply_markup,
-                parse_mode=ParseMode.HTML
-            )
-        except Exception as e:
-            logger.error(f"Failed to edit message: {e}")
-            try:
-                query.message.reply_text(text, reply_markup=reply_markup)
-            except Exception as e2:
-                logger.error(f"Failed to send new message: {e2}")
+            logger.error("Failed to send callback error: %s", e)
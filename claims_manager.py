@@ -187,7 +187,7 @@ class ClaimsManager:
     def _process_photo_upload(self, user_id: int, photo_data: bytes, claim_data: Dict[str, Any]) -> Dict[str, Any]:
         """Process photo upload step with memory-optimized error handling."""
         try:
-            logger.debug(f"Processing photo upload for user {user_id}, size: {len(photo_data)} bytes")
+            logger.debug("Processing photo upload for user %s, size: %d bytes", user_id, len(photo_data))
             
             # Validate photo using new validation system
             validation_result = validate_photo_file(photo_data)
@@ -214,12 +214,6 @@ class ClaimsManager:
                 success = True
                 error_msg = None
                 
-                # Release memory immediately after successful upload to reduce memory usage
-                del photo_data
-                import gc
-                gc.collect()
-                logger.info("[MEMORY] Released file_data after successful Drive upload")
-                
             except Exception as e:
                 success = False
                 receipt_link = None
@@ -253,10 +247,6 @@ class ClaimsManager:
                 'keyboard': KeyboardBuilder.cancel_keyboard(),
                 'success': False
             }
-        finally:
-            # Force garbage collection after photo processing
-            import gc
-            gc.collect()
     
     def _process_confirmation(self, user_id: int, callback_data: str, claim_data: Dict[str, Any]) -> Dict[str, Any]:
         """Process confirmation step."""
@@ -331,12 +321,12 @@ class ClaimsManager:
             
             # Upload to category-specific folder (lazy loading)
             drive_client = self.lazy_client_manager.get_drive_client()
-            file_id = drive_client._upload_photo_sync(
+            file_id, is_public = drive_client._upload_and_share_photo_sync(
                 photo_data, filename, category_folder_id
             )
             
-            # Get shareable link for the uploaded file
-            shareable_link = drive_client._get_shareable_link_sync(file_id)
+            # Get shareable link for the uploaded file, granting public access only if the upload couldn't
+            shareable_link = drive_client._get_shareable_link_sync(file_id, make_public=not is_public)
             
             logger.info(f"Successfully uploaded receipt for user {user_id}, category {category}, link: {shareable_link}")
             return shareable_link
@@ -388,51 +378,37 @@ class ClaimsManager:
         
         return f"{month}/{day}/{year} {hour_12}:{minute:02d}{ampm}"
     
-    def _get_user_name(self, user_id: int) -> str:
+    def _get_user_name_and_role(self, user_id: int) -> Tuple[str, str]:
         """
-        Get user's registered name by user_id
+        Get user's registered name and role by user_id with a single lookup
         
         Args:
             user_id: Telegram user ID
             
         Returns:
-            str: User's registered name or user_id as fallback
+            Tuple of (name, role), falling back to user_id and 'Staff'
         """
         try:
             # Get user data from sheets_client (lazy loading)
             sheets_client = self.lazy_client_manager.get_sheets_client()
             user_data = sheets_client._get_user_sync(user_id)
-            if user_data and 'name' in user_data:
-                return user_data['name']
-            else:
-                logger.warning(f"User name not found for user_id {user_id}, using user_id as fallback")
-                return str(user_id)
         except Exception as e:
-            logger.error(f"Error getting user name for user_id {user_id}: {e}")
-            return str(user_id)
-    
-    def _get_user_role(self, user_id: int) -> str:
-        """
-        Get user's role by user_id
+            logger.error(f"Error getting user data for user_id {user_id}: {e}")
+            user_data = None
         
-        Args:
-            user_id: Telegram user ID
-            
-        Returns:
-            str: User's role (Staff/Manager/Ambassador) or 'Staff' as fallback
-        """
-        try:
-            # Get user data from sheets_client (lazy loading)
-            sheets_client = self.lazy_client_manager.get_sheets_client()
-            user_data = sheets_client._get_user_sync(user_id)
-            if user_data and 'role' in user_data:
-                return user_data['role']
-            else:
-                logger.warning(f"User role not found for user_id {user_id}, using 'Staff' as fallback")
-                return 'Staff'
-        except Exception as e:
-            logger.error(f"Error getting user role for user_id {user_id}: {e}")
-            return 'Staff'
+        if user_data and 'name' in user_data:
+            user_name = user_data['name']
+        else:
+            logger.warning(f"User name not found for user_id {user_id}, using user_id as fallback")
+            user_name = str(user_id)
+        
+        if user_data and 'role' in user_data:
+            user_role = user_data['role']
+        else:
+            logger.warning(f"User role not found for user_id {user_id}, using 'Staff' as fallback")
+            user_role = 'Staff'
+        
+        return user_name, user_role
 
     def submit_claim(self, user_id: int, claim_data: Dict[str, Any]) -> bool:
         """
@@ -447,8 +423,7 @@ class ClaimsManager:
         """
         try:
             # Get user information
-            user_name = self._get_user_name(user_id)
-            user_role = self._get_user_role(user_id)
+            user_name, user_role = self._get_user_name_and_role(user_id)
             
             # Handle category - for Other with description, store as is
             category_value = claim_data['category']
@@ -6,6 +6,12 @@ import os
 import json
 from typing import Optional
 
+# OAuth scopes for both Drive and Sheets access, GOOGLE_TOKEN_JSON must have been granted these
+GOOGLE_SCOPES = [
+    'https://www.googleapis.com/auth/drive.file',
+    'https://www.googleapis.com/auth/spreadsheets'
+]
+
 class Config:
     """Configuration class for managing environment variables"""
     
@@ -30,8 +36,14 @@ class Config:
         
         # Deployment Configuration
         self.WEBHOOK_URL = os.getenv('WEBHOOK_URL')
+        self.WEBHOOK_MAX_CONNECTIONS = int(os.getenv('WEBHOOK_MAX_CONNECTIONS', '40'))
+        # Optional shared secret Telegram echoes in X-Telegram-Bot-Api-Secret-Token (1-256 chars of A-Z, a-z, 0-9, _ and -)
+        self.WEBHOOK_SECRET_TOKEN = os.getenv('WEBHOOK_SECRET_TOKEN')
         self.PORT = int(os.getenv('PORT', '8000'))
         
+        # Telegram Bot API connection pool (shared by all threads sending messages)
+        self.TELEGRAM_CON_POOL_SIZE = int(os.getenv('TELEGRAM_CON_POOL_SIZE', '16'))
+        
         # Validate Google OAuth token
         self._validate_google_token()
     
@@ -5,9 +5,9 @@ This module provides the DayOffManager class that handles day-off request proces
 with simplified logic (state management now handled by ConversationHandler).
 """
 
-import asyncio
 import logging
 from datetime import datetime
+from typing import Optional
 import pytz
 from models import DayOffRequest, UserRole
 
@@ -17,6 +17,9 @@ from error_handler import global_error_handler, with_error_handling
 
 logger = logging.getLogger(__name__)
 
+# Roles allowed to submit day-off requests
+DAYOFF_ALLOWED_ROLES = frozenset({UserRole.STAFF, UserRole.MANAGER})
+
 
 class DayOffManager:
     """
@@ -63,7 +66,7 @@ class DayOffManager:
                 }
             
             # Check if user role allows day-off requests (Staff and Manager only)
-            if user_data.role not in [UserRole.STAFF, UserRole.MANAGER]:
+            if user_data.role not in DAYOFF_ALLOWED_ROLES:
                 logger.info("User %d (%s) attempted day-off request but role %s not allowed", 
                            user_id, user_data.name, user_data.role.value)
                 return {
@@ -76,6 +79,7 @@ class DayOffManager:
             
             return {
                 'success': True,
+                'user_name': user_data.name,
                 'message': f'🗓️ <b>Day-off Request System</b>\n\nHello <b>{user_data.name}</b>!\n\nIs this a <b>One-day</b> or <b>Multiple-day</b> day-off?\n\nPlease select an option below:',
                 'keyboard': KeyboardBuilder.dayoff_type_keyboard()
             }
@@ -88,7 +92,8 @@ class DayOffManager:
                 'keyboard': None
             }
     
-    def save_dayoff_request(self, user_id: int, dayoff_type: str, dayoff_date: str, reason: str) -> bool:
+    def save_dayoff_request(self, user_id: int, dayoff_type: str, dayoff_date: str, reason: str,
+                            user_name: Optional[str] = None) -> bool:
         """
         Save completed day-off request to Google Sheets
         
@@ -97,16 +102,18 @@ class DayOffManager:
             dayoff_type: Type of day-off ('oneday' or 'multiday')
             dayoff_date: Date string (DD/MM/YYYY or DD/MM/YYYY - DD/MM/YYYY)
             reason: Reason for day-off
+            user_name: Name looked up when the request was started, fetched again if not given
             
         Returns:
             bool: True if successful
         """
         try:
-            # Get user data
-            user_data = self.user_manager.get_user_data(user_id)
-            if not user_data:
-                logger.error("Cannot save day-off request: user %d not found", user_id)
-                return False
+            if user_name is None:
+                user_data = self.user_manager.get_user_data(user_id)
+                if not user_data:
+                    logger.error("Cannot save day-off request: user %d not found", user_id)
+                    return False
+                user_name = user_data.name
             
             # Create day-off request object
             dayoff_request = DayOffRequest(
@@ -114,7 +121,7 @@ class DayOffManager:
                 dayoff_date=dayoff_date,
                 reason=reason,
                 submitted_by=user_id,
-                submitted_by_name=user_data.name,
+                submitted_by_name=user_name,
                 status="Pending"
             )
             
@@ -128,22 +135,12 @@ class DayOffManager:
                 'status': dayoff_request.status
             }
             
-            # Get sheets client with lazy loading
+            # Submit to Request Day-off sheet (lazy loading)
             sheets_client = self.lazy_client_manager.get_sheets_client()
-            
-            # Use asyncio to call async method
-            try:
-                loop = asyncio.get_event_loop()
-            except RuntimeError:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-            
-            success = loop.run_until_complete(
-                sheets_client.append_dayoff_data(dayoff_data)
-            )
+            success = sheets_client.append_dayoff_data(dayoff_data)
             
             if success:
-                logger.info("Successfully saved day-off request for user %d (%s)", user_id, user_data.name)
+                logger.info("Successfully saved day-off request for user %d (%s)", user_id, user_name)
                 return True
             else:
                 logger.error("Failed to save day-off request for user %d", user_id)
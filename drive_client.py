@@ -6,9 +6,12 @@ for receipt photos organized by category and date.
 import asyncio
 import json
 import io
+import threading
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
+import httplib2
 from google.oauth2.credentials import Credentials
+from google_auth_httplib2 import AuthorizedHttp
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 from googleapiclient.http import MediaIoBaseUpload
@@ -19,47 +22,36 @@ logger = logging.getLogger(__name__)
 class DriveClient:
     """Client for Google Drive API operations"""
     
-    def __init__(self, root_folder_id: Optional[str] = None):
+    def __init__(self, root_folder_id: Optional[str], credentials: Credentials):
         """
         Initialize Google Drive client with OAuth credentials
         
         Args:
             root_folder_id: Optional root folder ID for organizing files
+            credentials: OAuth credentials loaded from GOOGLE_TOKEN_JSON, shared with the Sheets client
         """
         self.root_folder_id = root_folder_id
-        self._service = None
-        self._credentials = self._create_oauth_credentials()
+        self._local = threading.local()  # Per-thread service, httplib2.Http is not thread-safe
+        self._credentials = credentials
         self._folder_cache = {}  # Cache folder IDs to avoid repeated API calls
         
-    def _create_oauth_credentials(self) -> Credentials:
-        """Create Google OAuth 2.0 user credentials from token.json file"""
-        # Define scopes for both Drive and Sheets access
-        scopes = [
-            'https://www.googleapis.com/auth/drive.file',
-            'https://www.googleapis.com/auth/spreadsheets'
-        ]
-        
-        try:
-            logger.info("Loading OAuth 2.0 user credentials from token.json")
-            credentials = Credentials.from_authorized_user_file("token.json", scopes)
-            logger.info("Successfully loaded OAuth credentials for Google Drive")
-            return credentials
-        except FileNotFoundError:
-            logger.error("token.json file not found. Make sure GOOGLE_TOKEN_JSON environment variable is set.")
-            raise ValueError("token.json file not found. Check GOOGLE_TOKEN_JSON environment variable.")
-        except Exception as e:
-            logger.error(f"Failed to create OAuth credentials: {e}")
-            raise ValueError(f"Invalid OAuth credentials: {e}")
-    
     def _get_service(self):
-        """Get or create Google Drive service instance"""
-        if self._service is None:
+        """
+        Get or create the calling thread's Google Drive service instance
+        
+        Update workers call the API concurrently, and a service wraps a single httplib2.Http
+        which must not be shared between threads, so each thread builds its own.
+        """
+        service = getattr(self._local, 'service', None)
+        if service is None:
             try:
-                self._service = build('drive', 'v3', credentials=self._credentials)
+                http = AuthorizedHttp(self._credentials, http=httplib2.Http())
+                service = build('drive', 'v3', http=http)
             except Exception as e:
                 logger.error(f"Failed to build Google Drive service: {e}")
                 raise
-        return self._service
+            self._local.service = service
+        return service
     
     def generate_folder_path(self, category: str, date: str) -> str:
         """
@@ -219,7 +211,16 @@ class DriveClient:
             raise
     
     def _upload_photo_sync(self, photo_data: bytes, filename: str, folder_id: str) -> str:
-        """Synchronous photo upload to shared folder with memory optimization"""
+        """Synchronous photo upload to shared folder, returning the file ID"""
+        return self._upload_and_share_photo_sync(photo_data, filename, folder_id)[0]
+    
+    def _upload_and_share_photo_sync(self, photo_data: bytes, filename: str, folder_id: str) -> Tuple[str, bool]:
+        """
+        Synchronous photo upload to shared folder with memory optimization
+        
+        Returns:
+            Tuple[str, bool]: File ID, and whether public read access was granted
+        """
         service = self._get_service()
         media_stream = None
         
@@ -237,7 +238,7 @@ class DriveClient:
             
             file_metadata['parents'] = [target_folder_id]
             
-            logger.debug(f"Uploading {filename} ({len(photo_data)} bytes) to folder {target_folder_id}")
+            logger.debug("Uploading %s (%s bytes) to folder %s", filename, len(photo_data), target_folder_id)
             
             # Create media upload object with explicit stream management
             media_stream = io.BytesIO(photo_data)
@@ -255,9 +256,10 @@ class DriveClient:
             ).execute()
             
             file_id = file.get('id')
-            logger.debug(f"Uploaded photo {filename} with ID: {file_id}")
+            logger.debug("Uploaded photo %s with ID: %s", filename, file_id)
             
             # Set file permissions
+            is_public = False
             try:
                 permission = {
                     'role': 'reader',
@@ -267,19 +269,12 @@ class DriveClient:
                     fileId=file_id,
                     body=permission
                 ).execute()
-                logger.debug(f"Set public read permissions for file {file_id}")
+                is_public = True
+                logger.debug("Set public read permissions for file %s", file_id)
             except HttpError as perm_error:
                 logger.warning(f"Could not set public permissions for file {file_id}: {perm_error}")
             
-            # Release memory immediately after successful upload to reduce memory usage
-            if media_stream is not None:
-                media_stream.close()
-                del media_stream
-                import gc
-                gc.collect()
-                logger.info("[MEMORY] Released file_data after successful Drive upload")
-            
-            return file_id
+            return file_id, is_public
             
         except HttpError as e:
             logger.error(f"HTTP error uploading photo {filename}: {e}")
@@ -327,9 +322,9 @@ class DriveClient:
             logger.error(f"Unexpected error uploading photo {filename}: {e}")
             raise
         finally:
-            # Fallback low-frequency timed GC (every 15 minutes) to prevent small object accumulation
-            # Note: Implement a background task in __init__ for timed GC
-            pass  # Placeholder; actual implementation in class init
+            # Release the upload buffer copy whether or not the upload succeeded
+            if media_stream is not None:
+                media_stream.close()
     
     async def get_shareable_link(self, file_id: str) -> str:
         """
@@ -350,21 +345,22 @@ class DriveClient:
             logger.error(f"Failed to get shareable link for {file_id}: {e}")
             raise
     
-    def _get_shareable_link_sync(self, file_id: str) -> str:
-        """Synchronous shareable link generation"""
+    def _get_shareable_link_sync(self, file_id: str, make_public: bool = True) -> str:
+        """Synchronous shareable link generation, make_public=False skips granting public read access"""
         service = self._get_service()
         
         try:
-            # Make file publicly viewable
-            permission = {
-                'role': 'reader',
-                'type': 'anyone'
-            }
-            
-            service.permissions().create(
-                fileId=file_id,
-                body=permission
-            ).execute()
+            if make_public:
+                # Make file publicly viewable
+                permission = {
+                    'role': 'reader',
+                    'type': 'anyone'
+                }
+                
+                service.permissions().create(
+                    fileId=file_id,
+                    body=permission
+                ).execute()
             
             # Get file info to construct shareable link
             file_info = service.files().get(
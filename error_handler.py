@@ -40,6 +40,13 @@ class ErrorSeverity(Enum):
     CRITICAL = "critical"
 
 
+# Severities logged at CRITICAL level
+_SEVERE_SEVERITIES = frozenset({ErrorSeverity.HIGH, ErrorSeverity.CRITICAL})
+
+# Google API status codes treated as authentication failures
+_AUTH_STATUS_CODES = frozenset({401, 403})
+
+
 class RetryConfig:
     """Configuration for retry mechanisms"""
     
@@ -99,7 +106,7 @@ class ErrorHandler:
             status_code = error.resp.status
             if status_code == 429:  # Rate limit
                 return ErrorType.RATE_LIMIT, ErrorSeverity.HIGH
-            elif status_code in [401, 403]:  # Auth errors
+            elif status_code in _AUTH_STATUS_CODES:  # Auth errors
                 return ErrorType.AUTHENTICATION, ErrorSeverity.HIGH
             elif status_code >= 500:  # Server errors
                 return ErrorType.GOOGLE_API, ErrorSeverity.HIGH
@@ -304,7 +311,7 @@ class ErrorHandler:
         }
         
         # Log based on severity
-        if error_severity in [ErrorSeverity.HIGH, ErrorSeverity.CRITICAL]:
+        if error_severity in _SEVERE_SEVERITIES:
             logger.critical(f"Critical error in {context}: {error_details}")
         elif error_severity == ErrorSeverity.MEDIUM:
             logger.error(f"Error in {context}: {error_details}")
@@ -331,11 +338,13 @@ class ErrorHandler:
         Returns:
             Dictionary with error statistics
         """
-        total_errors = sum(self.error_counts.values())
+        total_errors = 0
         
-        # Group by error type
+        # Total and group by error type in a single pass
         type_counts = {}
         for key, count in self.error_counts.items():
+            total_errors += count
+            
             # Extract context from key (format: userid_context)
             if '_' in key:
                 context = key.split('_', 1)[1]
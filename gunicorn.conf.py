@@ -16,10 +16,13 @@ backlog = 2048
 # which can cause the bot to lose track of conversation state when requests are load-balanced
 # across different workers
 workers = 1
-worker_class = "sync"
+# Concurrency comes from threads inside the single worker instead: webhook POSTs and
+# health probes are served in parallel and idle connections are kept alive for reuse
+worker_class = "gthread"
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
 worker_connections = 1000
 timeout = 30
-keepalive = 2
+keepalive = 5
 
 # Restart workers after this many requests, to prevent memory leaks
 max_requests = 1000
@@ -72,6 +75,10 @@ def pre_fork(server, worker):
 def post_fork(server, worker):
     """Called just after a worker has been forked."""
     server.log.info("Worker spawned (pid: %s)", worker.pid)
+    
+    # Initialize the bot inside the worker, threads started before the fork would not survive it
+    from app import start_bot_initialization
+    start_bot_initialization()
 
 def worker_abort(worker):
     """Called when a worker received the SIGABRT signal."""
@@ -6,7 +6,8 @@ import logging
 import threading
 import time
 from datetime import datetime
-from flask import Flask, jsonify
+from flask import Flask
+from json_helper import json_response
 
 logger = logging.getLogger(__name__)
 
@@ -40,7 +41,7 @@ class HealthServer:
                 uptime_seconds = time.time() - self.start_time
                 uptime_hours = uptime_seconds / 3600
                 
-                return jsonify({
+                return json_response({
                     'status': 'healthy',
                     'service': 'telegram-claim-bot',
                     'timestamp': time.time(),
@@ -52,16 +53,16 @@ class HealthServer:
                     'monitoring_interval': '10_minutes',
                     'version': '1.0.0',
                     'deployment': 'development'
-                }), 200
+                }, 200)
                 
             except Exception as e:
                 logger.error(f"Health check failed: {e}")
-                return jsonify({
+                return json_response({
                     'status': 'unhealthy',
                     'service': 'telegram-claim-bot',
                     'timestamp': time.time(),
                     'error': 'Health check failed'
-                }), 500
+                }, 500)
         
         @self.app.route('/status')
         def status_check():
@@ -69,7 +70,7 @@ class HealthServer:
             try:
                 uptime_seconds = time.time() - self.start_time
                 
-                return jsonify({
+                return json_response({
                     'service': 'telegram-claim-bot',
                     'status': 'running',
                     'timestamp': time.time(),
@@ -81,21 +82,21 @@ class HealthServer:
                     'last_health_check': self.last_health_check,
                     'keep_alive_active': self.is_keep_alive_running(),
                     'version': '1.0.0'
-                }), 200
+                }, 200)
                 
             except Exception as e:
                 logger.error(f"Status check failed: {e}")
-                return jsonify({
+                return json_response({
                     'service': 'telegram-claim-bot',
                     'status': 'error',
                     'timestamp': time.time(),
                     'error': str(e)
-                }), 500
+                }, 500)
         
         @self.app.route('/')
         def root():
             """Root endpoint"""
-            return jsonify({
+            return json_response({
                 'service': 'telegram-claim-bot',
                 'message': 'Telegram Claim Bot is running',
                 'health_endpoint': '/health',
@@ -0,0 +1,32 @@
+"""
+JSON Helper for Telegram Claim Bot
+Shared JSON encoding/decoding for the webhook app and the health server,
+using orjson when available and the standard library otherwise.
+"""
+import json
+from flask import Response
+
+# Fast JSON encoding/decoding (optional)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def json_loads(data):
+    """Decode a JSON request body, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def json_dumps(obj) -> bytes:
+    """Encode an object as JSON bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode()
+
+def json_response(obj, status=200, max_age=None):
+    """Build a JSON response, using orjson when available, optionally cacheable for max_age seconds"""
+    response = Response(json_dumps(obj), status=status, mimetype='application/json')
+    if max_age is not None:
+        response.headers['Cache-Control'] = f'public, max-age={max_age}'
+    return response
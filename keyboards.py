@@ -5,6 +5,7 @@ This module provides the KeyboardBuilder class that generates various inline key
 for the Telegram Claim Bot, including role selection, claim categories, and confirmation dialogs.
 """
 
+from functools import lru_cache
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
 from typing import List, Tuple
 
@@ -16,9 +17,11 @@ class KeyboardBuilder:
     """
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def role_selection_keyboard() -> InlineKeyboardMarkup:
         """
         Create inline keyboard for user role selection during registration.
+        Roles are fixed, so the markup is built once and reused.
         
         Returns:
             InlineKeyboardMarkup: Keyboard with Staff, Manager, Ambassador options
@@ -31,6 +34,7 @@ class KeyboardBuilder:
         return InlineKeyboardMarkup(keyboard)
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def claim_categories_keyboard() -> InlineKeyboardMarkup:
         """
         Create inline keyboard for expense claim category selection.
@@ -58,6 +62,7 @@ class KeyboardBuilder:
         return InlineKeyboardMarkup(keyboard)
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def confirmation_keyboard() -> InlineKeyboardMarkup:
         """
         Create inline keyboard for confirmation dialogs.
@@ -74,6 +79,7 @@ class KeyboardBuilder:
         return InlineKeyboardMarkup(keyboard)
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def registration_complete_keyboard() -> InlineKeyboardMarkup:
         """
         Create inline keyboard shown after successful registration.
@@ -87,6 +93,7 @@ class KeyboardBuilder:
         return InlineKeyboardMarkup(keyboard)
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def register_now_keyboard() -> InlineKeyboardMarkup:
         """
         Create inline keyboard for unregistered users in /start command.
@@ -100,6 +107,7 @@ class KeyboardBuilder:
         return InlineKeyboardMarkup(keyboard)
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def start_claim_keyboard() -> InlineKeyboardMarkup:
         """
         Create inline keyboard for registered users in /start command.
@@ -113,6 +121,7 @@ class KeyboardBuilder:
         return InlineKeyboardMarkup(keyboard)
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def claim_complete_keyboard() -> InlineKeyboardMarkup:
         """
         Create inline keyboard shown after successful claim submission.
@@ -126,6 +135,7 @@ class KeyboardBuilder:
         return InlineKeyboardMarkup(keyboard)
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def back_keyboard() -> InlineKeyboardMarkup:
         """
         Create inline keyboard with back button for navigation.
@@ -139,6 +149,7 @@ class KeyboardBuilder:
         return InlineKeyboardMarkup(keyboard)
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def cancel_keyboard() -> InlineKeyboardMarkup:
         """
         Create inline keyboard with cancel button for ongoing processes.
@@ -152,6 +163,7 @@ class KeyboardBuilder:
         return InlineKeyboardMarkup(keyboard)
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def dayoff_type_keyboard() -> InlineKeyboardMarkup:
         """
         Create inline keyboard for day-off type selection.
@@ -167,6 +179,7 @@ class KeyboardBuilder:
         return InlineKeyboardMarkup(keyboard)
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def universal_start_keyboard() -> InlineKeyboardMarkup:
         """
         Create universal start keyboard with both registration and claim options.
@@ -194,12 +207,8 @@ class KeyboardBuilder:
         Returns:
             InlineKeyboardMarkup: Custom keyboard layout
         """
-        keyboard = []
-        for i in range(0, len(buttons), columns):
-            row = []
-            for j in range(columns):
-                if i + j < len(buttons):
-                    text, callback_data = buttons[i + j]
-                    row.append(InlineKeyboardButton(text, callback_data=callback_data))
-            keyboard.append(row)
+        keyboard = [
+            [InlineKeyboardButton(text, callback_data=callback_data) for text, callback_data in buttons[i:i + columns]]
+            for i in range(0, len(buttons), columns)
+        ]
         return InlineKeyboardMarkup(keyboard)
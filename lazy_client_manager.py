@@ -5,8 +5,10 @@ Implements lazy loading to reduce memory usage during startup
 
 import logging
 import gc
+import threading
 from typing import Optional
-from config import Config
+from google.oauth2.credentials import Credentials
+from config import Config, GOOGLE_SCOPES
 from sheets_client import SheetsClient
 from drive_client import DriveClient
 
@@ -28,7 +30,8 @@ class LazyClientManager:
         self.config = config
         self._sheets_client: Optional[SheetsClient] = None
         self._drive_client: Optional[DriveClient] = None
-        self._initialization_lock = False
+        self._credentials: Optional[Credentials] = None
+        self._initialization_lock = threading.Lock()  # Update workers may request clients concurrently
         
         logger.info("LazyClientManager initialized - clients will be loaded on demand")
     
@@ -40,7 +43,9 @@ class LazyClientManager:
             SheetsClient instance
         """
         if self._sheets_client is None:
-            self._initialize_sheets_client()
+            with self._initialization_lock:
+                if self._sheets_client is None:
+                    self._initialize_sheets_client()
         return self._sheets_client
     
     def get_drive_client(self) -> DriveClient:
@@ -51,21 +56,16 @@ class LazyClientManager:
             DriveClient instance
         """
         if self._drive_client is None:
-            self._initialize_drive_client()
+            with self._initialization_lock:
+                if self._drive_client is None:
+                    self._initialize_drive_client()
         return self._drive_client
     
     def _initialize_sheets_client(self):
-        """Initialize Google Sheets client with memory monitoring"""
-        if self._initialization_lock:
-            return
-        
+        """Initialize Google Sheets client with memory monitoring (caller holds _initialization_lock)"""
         try:
-            self._initialization_lock = True
             logger.info("Lazy loading Google Sheets client...")
             
-            # Create token.json if it doesn't exist
-            self._ensure_token_file()
-            
             # Initialize with memory monitoring
             import psutil
             if psutil:
@@ -74,7 +74,8 @@ class LazyClientManager:
                 logger.info(f"[MEMORY] Before Sheets client init: {memory_before:.2f} MB")
             
             self._sheets_client = SheetsClient(
-                spreadsheet_id=self.config.GOOGLE_SPREADSHEET_ID
+                spreadsheet_id=self.config.GOOGLE_SPREADSHEET_ID,
+                credentials=self._get_credentials()
             )
             
             if psutil:
@@ -87,21 +88,12 @@ class LazyClientManager:
         except Exception as e:
             logger.error(f"Failed to initialize Google Sheets client: {e}")
             raise
-        finally:
-            self._initialization_lock = False
     
     def _initialize_drive_client(self):
-        """Initialize Google Drive client with memory monitoring"""
-        if self._initialization_lock:
-            return
-        
+        """Initialize Google Drive client with memory monitoring (caller holds _initialization_lock)"""
         try:
-            self._initialization_lock = True
             logger.info("Lazy loading Google Drive client...")
             
-            # Create token.json if it doesn't exist
-            self._ensure_token_file()
-            
             # Initialize with memory monitoring
             import psutil
             if psutil:
@@ -110,7 +102,8 @@ class LazyClientManager:
                 logger.info(f"[MEMORY] Before Drive client init: {memory_before:.2f} MB")
             
             self._drive_client = DriveClient(
-                root_folder_id=self.config.GOOGLE_DRIVE_FOLDER_ID
+                root_folder_id=self.config.GOOGLE_DRIVE_FOLDER_ID,
+                credentials=self._get_credentials()
             )
             
             if psutil:
@@ -123,17 +116,19 @@ class LazyClientManager:
         except Exception as e:
             logger.error(f"Failed to initialize Google Drive client: {e}")
             raise
-        finally:
-            self._initialization_lock = False
     
-    def _ensure_token_file(self):
-        """Ensure token.json file exists"""
-        import os
-        if not os.path.exists("token.json"):
-            logger.info("Creating token.json file from environment variable")
-            with open("token.json", "w") as f:
-                f.write(self.config.GOOGLE_TOKEN_JSON)
-            logger.info("token.json file created successfully")
+    def _get_credentials(self) -> Credentials:
+        """Load OAuth credentials straight from GOOGLE_TOKEN_JSON once, shared by both clients"""
+        if self._credentials is None:
+            try:
+                self._credentials = Credentials.from_authorized_user_info(
+                    self.config.get_google_token_dict(), GOOGLE_SCOPES
+                )
+                logger.info("Loaded OAuth 2.0 user credentials from GOOGLE_TOKEN_JSON")
+            except Exception as e:
+                logger.error(f"Failed to create OAuth credentials: {e}")
+                raise ValueError(f"Invalid OAuth credentials: {e}")
+        return self._credentials
     
     def is_sheets_client_initialized(self) -> bool:
         """Check if Sheets client is initialized"""
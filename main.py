@@ -4,7 +4,8 @@ Integrates all components and handles application startup with webhook/polling s
 """
 import os
 import logging
-from config import Config
+from google.oauth2.credentials import Credentials
+from config import Config, GOOGLE_SCOPES
 from health import HealthServer
 from bot_handler import TelegramBot
 from user_manager import UserManager
@@ -26,20 +27,19 @@ def initialize_google_clients(config: Config):
     try:
         logger.info("Initializing Google API clients with OAuth credentials...")
         
-        # Create token.json file from GOOGLE_TOKEN_JSON environment variable
-        logger.info("Creating token.json file from GOOGLE_TOKEN_JSON environment variable")
-        with open("token.json", "w") as f:
-            f.write(config.GOOGLE_TOKEN_JSON)
-        logger.info("token.json file created successfully")
+        # Load credentials from GOOGLE_TOKEN_JSON in memory instead of writing token.json to disk
+        credentials = Credentials.from_authorized_user_info(config.get_google_token_dict(), GOOGLE_SCOPES)
         
         # Initialize Google Sheets client with OAuth
         sheets_client = SheetsClient(
-            spreadsheet_id=config.GOOGLE_SPREADSHEET_ID
+            spreadsheet_id=config.GOOGLE_SPREADSHEET_ID,
+            credentials=credentials
         )
         
         # Initialize Google Drive client with OAuth
         drive_client = DriveClient(
-            root_folder_id=config.GOOGLE_DRIVE_FOLDER_ID
+            root_folder_id=config.GOOGLE_DRIVE_FOLDER_ID,
+            credentials=credentials
         )
         
         logger.info("Google API clients initialized successfully with OAuth credentials")
@@ -81,7 +81,8 @@ def start_bot_application(config: Config):
             token=config.TELEGRAM_BOT_TOKEN,
             user_manager=user_manager,
             claims_manager=claims_manager,
-            dayoff_manager=dayoff_manager
+            dayoff_manager=dayoff_manager,
+            con_pool_size=config.TELEGRAM_CON_POOL_SIZE
         )
         
         # Memory monitoring - after bot init
@@ -100,7 +101,11 @@ def start_bot_application(config: Config):
             # Production mode with webhook (Gunicorn handles Flask server)
             logger.info(f"Setting webhook for production deployment: {config.WEBHOOK_URL}")
             logger.info("Note: Use 'gunicorn -c gunicorn.conf.py app:app' to start the server")
-            bot.start_webhook(config.WEBHOOK_URL, config.PORT)
+            bot.start_webhook(
+                config.WEBHOOK_URL, config.PORT,
+                max_connections=config.WEBHOOK_MAX_CONNECTIONS,
+                secret_token=config.WEBHOOK_SECRET_TOKEN
+            )
         else:
             # Development mode with polling
             logger.info("Starting polling mode for development")
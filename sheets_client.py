@@ -5,58 +5,55 @@ worksheet management, and data operations.
 """
 import asyncio
 import json
+import time
+import threading
 from datetime import datetime
 from typing import Dict, List, Optional, Any
+import httplib2
 from google.oauth2.credentials import Credentials
+from google_auth_httplib2 import AuthorizedHttp
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 import logging
 
 logger = logging.getLogger(__name__)
 
+# How long cached role worksheet rows are served before re-reading Google Sheets
+WORKSHEET_CACHE_TTL = 60  # seconds
+
 class SheetsClient:
     """Client for Google Sheets API operations"""
     
-    def __init__(self, spreadsheet_id: str):
+    def __init__(self, spreadsheet_id: str, credentials: Credentials):
         """
         Initialize Google Sheets client with OAuth credentials
         
         Args:
             spreadsheet_id: Google Sheets spreadsheet ID
+            credentials: OAuth credentials loaded from GOOGLE_TOKEN_JSON, shared with the Drive client
         """
         self.spreadsheet_id = spreadsheet_id
-        self._service = None
-        self._credentials = self._create_oauth_credentials()
-        
-    def _create_oauth_credentials(self) -> Credentials:
-        """Create Google OAuth 2.0 user credentials from token.json file"""
-        # Define scopes for both Drive and Sheets access
-        scopes = [
-            'https://www.googleapis.com/auth/drive.file',
-            'https://www.googleapis.com/auth/spreadsheets'
-        ]
+        self._local = threading.local()  # Per-thread service, httplib2.Http is not thread-safe
+        self._credentials = credentials
+        self._worksheet_cache = {}  # Cache role worksheet users indexed by Telegram ID to avoid repeated API calls
         
-        try:
-            logger.info("Loading OAuth 2.0 user credentials from token.json")
-            credentials = Credentials.from_authorized_user_file("token.json", scopes)
-            logger.info("Successfully loaded OAuth credentials for Google Sheets")
-            return credentials
-        except FileNotFoundError:
-            logger.error("token.json file not found. Make sure GOOGLE_TOKEN_JSON environment variable is set.")
-            raise ValueError("token.json file not found. Check GOOGLE_TOKEN_JSON environment variable.")
-        except Exception as e:
-            logger.error(f"Failed to create OAuth credentials: {e}")
-            raise ValueError(f"Invalid OAuth credentials: {e}")
-    
     def _get_service(self):
-        """Get or create Google Sheets service instance"""
-        if self._service is None:
+        """
+        Get or create the calling thread's Google Sheets service instance
+        
+        Update workers call the API concurrently, and a service wraps a single httplib2.Http
+        which must not be shared between threads, so each thread builds its own.
+        """
+        service = getattr(self._local, 'service', None)
+        if service is None:
             try:
-                self._service = build('sheets', 'v4', credentials=self._credentials)
+                http = AuthorizedHttp(self._credentials, http=httplib2.Http())
+                service = build('sheets', 'v4', http=http)
             except Exception as e:
                 logger.error(f"Failed to build Google Sheets service: {e}")
                 raise
-        return self._service
+            self._local.service = service
+        return service
     
     async def create_worksheet_if_not_exists(self, title: str) -> bool:
         """
@@ -121,9 +118,9 @@ class SheetsClient:
             logger.error(f"Unexpected error creating worksheet {title}: {e}")
             raise    
     
-    async def append_registration_data(self, worksheet: str, user_data: Dict[str, Any]) -> bool:
+    def append_registration_data(self, worksheet: str, user_data: Dict[str, Any]) -> bool:
         """
-        Append user registration data to specified worksheet
+        Append user registration data to specified worksheet, blocking until the row is written
         
         Args:
             worksheet: Name of the worksheet to append to
@@ -133,9 +130,6 @@ class SheetsClient:
             bool: True if data was successfully appended
         """
         try:
-            # Ensure worksheet exists
-            await self.create_worksheet_if_not_exists(worksheet)
-            
             # Format register date to Malaysia timezone format (DD/MM/YYYY HH:MMam/pm)
             register_date_str = user_data.get('register_date', datetime.now().isoformat())
             formatted_register_date = self._format_malaysia_datetime(register_date_str)
@@ -149,11 +143,8 @@ class SheetsClient:
                 formatted_register_date
             ]
             
-            # Run in thread pool
-            loop = asyncio.get_event_loop()
-            return await loop.run_in_executor(
-                None, self._append_data_sync, worksheet, [values], 'A:E'
-            )
+            # Creates the worksheet and its headers if missing
+            return self._append_data_sync(worksheet, [values], 'A:E')
             
         except Exception as e:
             logger.error(f"Failed to append registration data: {e}")
@@ -197,9 +188,9 @@ class SheetsClient:
             logger.error(f"Failed to append claim data: {e}")
             raise
     
-    async def append_dayoff_data(self, dayoff_data: Dict[str, Any]) -> bool:
+    def append_dayoff_data(self, dayoff_data: Dict[str, Any]) -> bool:
         """
-        Append day-off request data to Request Day-off worksheet
+        Append day-off request data to Request Day-off worksheet, blocking until the row is written
         
         Args:
             dayoff_data: Dictionary containing day-off request data
@@ -209,26 +200,21 @@ class SheetsClient:
         """
         try:
             worksheet = "Request Day-off"
-            await self.create_worksheet_if_not_exists(worksheet)
             
-            # Format request date to Malaysia timezone format (DD/MM/YYYY HH:MMam/pm)
-            request_date_str = dayoff_data.get('request_date', datetime.now().isoformat())
-            formatted_request_date = self._format_malaysia_datetime(request_date_str)
+            # Request date is written as given, callers pass it already formatted (DD/MM/YYYY HH:MMAM/PM)
+            request_date = dayoff_data.get('request_date') or datetime.now().strftime('%d/%m/%Y %I:%M%p')
             
             # Prepare data row
             values = [
-                formatted_request_date,
+                request_date,
                 dayoff_data.get('dayoff_date', ''),
                 dayoff_data.get('reason', ''),
                 dayoff_data.get('submitted_by_name', ''),
                 dayoff_data.get('status', 'Pending')
             ]
             
-            # Run in thread pool
-            loop = asyncio.get_event_loop()
-            return await loop.run_in_executor(
-                None, self._append_data_sync, worksheet, [values], 'A:E'
-            )
+            # Creates the worksheet and its headers if missing
+            return self._append_data_sync(worksheet, [values], 'A:E')
             
         except Exception as e:
             logger.error(f"Failed to append day-off data: {e}")
@@ -310,6 +296,10 @@ class SheetsClient:
         except Exception as e:
             logger.error(f"Unexpected error appending data to {worksheet}: {e}")
             raise
+        finally:
+            # Drop cached rows once the append has landed (or may have), a lookup that ran
+            # while the request was in flight could have re-cached the pre-append rows
+            self._worksheet_cache.pop(worksheet, None)
     
     def _ensure_worksheet_exists(self, worksheet: str):
         """Ensure worksheet exists, create if it doesn't"""
@@ -417,99 +407,106 @@ class SheetsClient:
             raise
     
     def _get_user_sync(self, user_id: int) -> Optional[Dict[str, Any]]:
-        """Optimized synchronous user lookup with memory management"""
-        import gc
-        
-        service = self._get_service()
-        
+        """Synchronous user lookup across all role worksheets, served from cache when fresh"""
         # Search in all possible role worksheets
         worksheets = ['Staff', 'Manager', 'Ambassador']
         
+        now = time.monotonic()
+        worksheet_users = {}
+        stale_worksheets = []
+        
         for worksheet in worksheets:
-            result = None
-            values = None
-            
-            try:
-                # Use batch request to limit data retrieval
-                # First, try to get only the first 100 rows to limit memory usage
-                result = service.spreadsheets().values().get(
-                    spreadsheetId=self.spreadsheet_id,
-                    range=f"{worksheet}!A1:E100"  # Limit to first 100 rows
-                ).execute()
-                
-                values = result.get('values', [])
-                
-                # Skip header row if it exists
-                if values and len(values) > 1:
-                    for row_idx, row in enumerate(values[1:], 1):  # Start from row 1 (skip header)
-                        if len(row) > 0 and str(row[0]) == str(user_id):
-                            user_data = {
-                                'telegram_user_id': int(row[0]) if row[0] else None,
-                                'name': row[1] if len(row) > 1 else '',
-                                'phone': row[2] if len(row) > 2 else '',
-                                'role': row[3] if len(row) > 3 else worksheet,
-                                'register_date': row[4] if len(row) > 4 else ''
-                            }
-                            
-                            # Clear large objects immediately
-                            del result, values
-                            gc.collect()
-                            
-                            return user_data
-                
-                # If not found in first 100 rows, try next batch
-                if len(values) >= 100:  # If we got 100 rows, there might be more
-                    # Clear current data before next request
-                    del result, values
-                    gc.collect()
-                    
-                    # Get next batch (rows 101-200)
-                    result = service.spreadsheets().values().get(
-                        spreadsheetId=self.spreadsheet_id,
-                        range=f"{worksheet}!A101:E200"
-                    ).execute()
-                    
-                    values = result.get('values', [])
-                    
-                    for row in values:
-                        if len(row) > 0 and str(row[0]) == str(user_id):
-                            user_data = {
-                                'telegram_user_id': int(row[0]) if row[0] else None,
-                                'name': row[1] if len(row) > 1 else '',
-                                'phone': row[2] if len(row) > 2 else '',
-                                'role': row[3] if len(row) > 3 else worksheet,
-                                'register_date': row[4] if len(row) > 4 else ''
-                            }
-                            
-                            # Clear large objects immediately
-                            del result, values
-                            gc.collect()
-                            
-                            return user_data
-                            
-            except HttpError as e:
-                if e.resp.status == 400:
-                    # Worksheet doesn't exist, continue searching
-                    continue
+            cached = self._worksheet_cache.get(worksheet)
+            if cached and now - cached[0] < WORKSHEET_CACHE_TTL:
+                worksheet_users[worksheet] = cached[1]
+            else:
+                stale_worksheets.append(worksheet)
+        
+        if stale_worksheets:
+            fetched = self._batch_get_worksheet_values_sync(stale_worksheets, 'A:E')
+            if fetched is None:
+                # Batch read failed, still search the worksheets that are cached
+                fetched = [None] * len(stale_worksheets)
+            
+            for worksheet, values in zip(stale_worksheets, fetched):
+                if values is None:
+                    # Read failed, search what we have but don't cache the gap
+                    users = {}
                 else:
-                    logger.error(f"Error searching in worksheet {worksheet}: {e}")
-                    continue
-            except Exception as e:
-                logger.error(f"Unexpected error searching in worksheet {worksheet}: {e}")
-                continue
-            finally:
-                # Always clean up large objects
-                try:
-                    if result:
-                        del result
-                    if values:
-                        del values
-                    gc.collect()
-                except:
-                    pass
+                    users = self._index_user_rows(worksheet, values)
+                    self._worksheet_cache[worksheet] = (now, users)
+                worksheet_users[worksheet] = users
+        
+        key = str(user_id)
+        for worksheet in worksheets:
+            user = worksheet_users[worksheet].get(key)
+            if user is not None:
+                return user
         
         return None
     
+    @staticmethod
+    def _index_user_rows(worksheet: str, values: List[List]) -> Dict[str, Dict[str, Any]]:
+        """Build a Telegram user ID -> user data lookup from a role worksheet's rows"""
+        users = {}
+        # Skip header row
+        for row in values[1:]:
+            # Only numeric IDs can match a Telegram user, anything else is skipped rather than parsed
+            if len(row) > 0 and str(row[0]).isdigit():
+                # setdefault keeps the first row for a user, as a top-down scan would
+                users.setdefault(str(row[0]), {
+                    'telegram_user_id': int(row[0]),
+                    'name': row[1] if len(row) > 1 else '',
+                    'phone': row[2] if len(row) > 2 else '',
+                    'role': row[3] if len(row) > 3 else worksheet,
+                    'register_date': row[4] if len(row) > 4 else ''
+                })
+        return users
+    
+    def _batch_get_worksheet_values_sync(self, worksheets: List[str], range_name: str) -> Optional[List[Optional[List[List]]]]:
+        """Read the same range from several worksheets in a single batchGet call"""
+        service = self._get_service()
+        
+        try:
+            result = service.spreadsheets().values().batchGet(
+                spreadsheetId=self.spreadsheet_id,
+                ranges=[f"{worksheet}!{range_name}" for worksheet in worksheets]
+            ).execute()
+            
+            return [value_range.get('values', []) for value_range in result.get('valueRanges', [])]
+            
+        except HttpError as e:
+            if e.resp.status != 400:
+                logger.error(f"Error reading worksheets {worksheets}: {e}")
+                return None
+            
+            # batchGet fails as a whole when a worksheet doesn't exist yet, fall back to one read per worksheet
+            return [self._get_worksheet_values_sync(worksheet, range_name) for worksheet in worksheets]
+        except Exception as e:
+            logger.error(f"Unexpected error reading worksheets {worksheets}: {e}")
+            return None
+    
+    def _get_worksheet_values_sync(self, worksheet: str, range_name: str) -> Optional[List[List]]:
+        """Read a range from a single worksheet, returning no rows if the worksheet is missing"""
+        service = self._get_service()
+        
+        try:
+            result = service.spreadsheets().values().get(
+                spreadsheetId=self.spreadsheet_id,
+                range=f"{worksheet}!{range_name}"
+            ).execute()
+            return result.get('values', [])
+            
+        except HttpError as e:
+            if e.resp.status == 400:
+                # Worksheet doesn't exist yet
+                return []
+            logger.error(f"Error reading worksheet {worksheet}: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Unexpected error reading worksheet {worksheet}: {e}")
+            return None
+    
     
     
     async def validate_spreadsheet_access(self) -> bool:
@@ -6,8 +6,6 @@ authentication, and permission checking. State management is now handled by Conv
 """
 
 import logging
-import gc
-import asyncio
 from datetime import datetime
 from typing import Optional, Dict, Any, Tuple
 from models import UserRegistration, UserRole
@@ -23,6 +21,13 @@ from error_handler import global_error_handler, with_error_handling
 
 logger = logging.getLogger(__name__)
 
+# Permission level of each role, higher levels include the lower ones
+ROLE_HIERARCHY = {
+    UserRole.STAFF: 1,
+    UserRole.MANAGER: 2,
+    UserRole.AMBASSADOR: 3
+}
+
 
 class UserManager:
     """
@@ -46,7 +51,7 @@ class UserManager:
     
     def is_user_registered(self, user_id: int) -> bool:
         """
-        Check if a user is already registered with memory optimization.
+        Check if a user is already registered.
         
         Args:
             user_id: Telegram user ID
@@ -54,10 +59,6 @@ class UserManager:
         Returns:
             True if user is registered, False otherwise
         """
-        import gc
-        
-        user_data = None
-        
         try:
             # Validate user ID
             is_valid, error_msg = validate_telegram_user_id_legacy(user_id)
@@ -76,15 +77,10 @@ class UserManager:
         except Exception as e:
             logger.error("Error checking registration for user %d: %s", user_id, e)
             return False
-        finally:
-            # Clean up user data immediately
-            if user_data:
-                del user_data
-            gc.collect()
     
     def get_user_data(self, user_id: int) -> Optional[UserRegistration]:
         """
-        Get user registration data with memory optimization.
+        Get user registration data.
         
         Args:
             user_id: Telegram user ID
@@ -92,11 +88,6 @@ class UserManager:
         Returns:
             UserRegistration object if found, None otherwise
         """
-        import gc
-        
-        user_data = None
-        registration = None
-        
         try:
             # Validate user ID
             is_valid, error_msg = validate_telegram_user_id_legacy(user_id)
@@ -127,11 +118,6 @@ class UserManager:
         except Exception as e:
             logger.error("Error getting user data for %d: %s", user_id, e)
             return None
-        finally:
-            # Clean up large objects immediately
-            if user_data:
-                del user_data
-            gc.collect()
     
     def process_registration_step(self, user_id: int, step: str, data: str) -> Dict[str, Any]:
         """
@@ -308,16 +294,8 @@ class UserManager:
             # Get sheets client with lazy loading
             sheets_client = self.lazy_client_manager.get_sheets_client()
             
-            # Use asyncio to call async method
-            try:
-                loop = asyncio.get_event_loop()
-            except RuntimeError:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-            
-            success = loop.run_until_complete(
-                sheets_client.append_registration_data(registration.role.value, user_data)
-            )
+            # Save to role-specific worksheet ('Staff', 'Manager' or 'Ambassador')
+            success = sheets_client.append_registration_data(registration.role.value, user_data)
             
             if success:
                 logger.info("Successfully saved registration for user %d (%s)", user_id, name)
@@ -332,7 +310,7 @@ class UserManager:
     
     def check_user_permission(self, user_id: int, required_role: Optional[UserRole] = None) -> Tuple[bool, Optional[str]]:
         """
-        Check if user has permission to perform an action with memory optimization.
+        Check if user has permission to perform an action.
         
         Args:
             user_id: Telegram user ID
@@ -341,33 +319,24 @@ class UserManager:
         Returns:
             Tuple of (has_permission, error_message)
         """
-        import gc
-        
-        user_data = None
-        
         try:
-            # Check if user is registered
-            if not self.is_user_registered(user_id):
-                return False, "You need to register first to use this feature. Please use /register command to register."
-            
             # If no specific role required, registration is sufficient
             if required_role is None:
+                if not self.is_user_registered(user_id):
+                    return False, "You need to register first to use this feature. Please use /register command to register."
                 return True, None
             
-            # Get user data and check role
+            # One lookup answers both whether the user is registered and which role they have,
+            # the registration check only runs to tell the two failures apart
             user_data = self.get_user_data(user_id)
             if not user_data:
+                if not self.is_user_registered(user_id):
+                    return False, "You need to register first to use this feature. Please use /register command to register."
                 return False, "Unable to get user information, please register again."
             
             # Check if user has required role or higher
-            role_hierarchy = {
-                UserRole.STAFF: 1,
-                UserRole.MANAGER: 2,
-                UserRole.AMBASSADOR: 3
-            }
-            
-            user_level = role_hierarchy.get(user_data.role, 0)
-            required_level = role_hierarchy.get(required_role, 0)
+            user_level = ROLE_HIERARCHY.get(user_data.role, 0)
+            required_level = ROLE_HIERARCHY.get(required_role, 0)
             
             if user_level >= required_level:
                 return True, None
@@ -377,8 +346,3 @@ class UserManager:
         except Exception as e:
             logger.error("Error checking permission for user %d: %s", user_id, e)
             return False, "Error checking permissions, please try again later."
-        finally:
-            # Clean up user data immediately
-            if user_data:
-                del user_data
-            gc.collect()